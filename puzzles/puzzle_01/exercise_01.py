@@ -3,9 +3,16 @@ Puzzle 01 - Exercise 01
 """
 
 from dataclasses import dataclass
+from itertools import accumulate
 from typing import List
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:  # the batch path falls back to plain lists
+    np = None
+
+from rotations import as_array, read_rotations
 
 
 
@@ -62,6 +69,30 @@ def dial(start: int, dial: Vector) -> int:
         else:
             return (start - steps) 
 
+# --- Batch path ---
+# The whole file as one sequence of signed distances (R positive, L negative):
+# the position after every rotation is the running sum modulo 100.
+
+def positions(rotations, start: int = 50):
+    """Dial position after every rotation."""
+    if np is not None:
+        return (start + np.cumsum(as_array(rotations))) % 100
+    return [(start + total) % 100 for total in accumulate(rotations)]
+
+
+def count_zero_stops(rotations, start: int = 50) -> int:
+    """Number of rotations that end on 0."""
+    if np is not None:
+        return int(np.count_nonzero(positions(rotations, start) == 0))
+    return positions(rotations, start).count(0)
+
+
+def solve_batch(input_file: str = "./input_01.txt", start_pos: int = 50) -> int:
+    sol = count_zero_stops(read_rotations(input_file), start_pos)
+    print(f"Result: {sol}")
+    return sol
+
+
 def solve():
     input_file = "./input_01.txt"
     vectors = read_input(input_file)
@@ -78,4 +109,10 @@ def solve():
     print(f"Result: {sol}")
     
 if __name__ == "__main__":
-    solve()
+    import sys
+
+    # --scalar: the original step-by-step walk through dial() (reference)
+    if "--scalar" in sys.argv:
+        solve()
+    else:
+        solve_batch()
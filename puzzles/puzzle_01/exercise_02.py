@@ -5,7 +5,14 @@ Puzzle 01 - Exercise 02
 from dataclasses import dataclass
 from typing import List
 from enum import Enum
-from typing import Tuple
+from typing import Iterable, Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the batch path falls back to a plain loop
+    np = None
+
+from rotations import as_array, read_rotations
 
 
 
@@ -69,6 +76,54 @@ def dial(start: int, dial: Vector, solution) -> Tuple[int, int]:
         else:
             return (start - steps), solution
 
+# --- Batch path ---
+# With unbounded positions (start + running sum of the signed distances) a
+# right turn from a to b clicks on 0 once per multiple of 100 in (a, b] and
+# a left turn once per multiple in [b, a): both are differences of floor
+# divisions, so every rotation is counted at once.
+
+def zero_click_step(position: int, distance: int) -> Tuple[int, int]:
+    """One signed rotation from position (0-99): (new position, clicks on 0), in O(1)."""
+    end = position + distance
+    if distance > 0:
+        clicks = end // 100 - position // 100
+    else:
+        clicks = (position - 1) // 100 - (end - 1) // 100
+    return end % 100, clicks
+
+
+def zero_crossings(rotations: Iterable[int], start: int = 50) -> Iterator[Tuple[int, int]]:
+    """Stream of signed rotations -> (position, clicks on 0) after each one."""
+    position = start
+    for distance in rotations:
+        position, clicks = zero_click_step(position, distance)
+        yield position, clicks
+
+
+def count_zero_clicks(rotations, start: int = 50) -> int:
+    """Clicks on 0 over all rotations, including rotations that end there."""
+    if np is None:
+        return sum(clicks for _, clicks in zero_crossings(rotations, start))
+    rotations = as_array(rotations)
+    path = np.empty(len(rotations) + 1, dtype=np.int64)  # unbounded positions, start included
+    path[0] = start
+    np.cumsum(rotations, out=path[1:])
+    path[1:] += start
+    hundreds = np.diff(path // 100)
+    # A left turn from a to b clicks (a - 1) // 100 - (b - 1) // 100 times, which
+    # is -hundreds, minus 1 if a is a multiple of 100, plus 1 if b is one
+    on_zero = path % 100 == 0
+    left = rotations < 0
+    return (int(np.abs(hundreds).sum()) + int(np.count_nonzero(on_zero[1:] & left))
+            - int(np.count_nonzero(on_zero[:-1] & left)))
+
+
+def solve_batch(input_file: str = "./input_01.txt", start_pos: int = 50) -> int:
+    sol = count_zero_clicks(read_rotations(input_file), start_pos)
+    print(f"Result: {sol}")
+    return sol
+
+
 def solve():
     input_file = "/home/hombu03/repos/AoC2025/puzzles/puzzle_01/input_01.txt"
     # input_file = "/home/hombu03/repos/AoC2025/puzzles/puzzle_01/test_01.txt"
@@ -87,6 +142,12 @@ def solve():
     
 
 if __name__ == "__main__":
-    solve()
+    import sys
+
+    # --scalar: the original step-by-step walk through dial() (reference)
+    if "--scalar" in sys.argv:
+        solve()
+    else:
+        solve_batch()
 
 # not: 6173, 7207
\ No newline at end of file
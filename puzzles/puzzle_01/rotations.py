@@ -0,0 +1,87 @@
+"""
+Puzzle 01 - Rotation input
+
+Batch reading of the rotation list shared by both exercises: the whole
+file as one sequence of signed distances (R positive, L negative).
+"""
+
+import re
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # callers fall back to plain lists
+    np = None
+
+ROTATION = re.compile(r"([LR])(\d+)")
+
+# Longest distance the numpy path parses (int64 holds any 18-digit number)
+MAX_DIGITS = 18
+
+
+def parse_rotations(text: str) -> List[int]:
+    """Signed distances line by line; raises ValueError on a malformed line."""
+    rotations = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        match = ROTATION.fullmatch(line)
+        if match is None:
+            raise ValueError(f"line {line_no}: malformed rotation {line!r}")
+        distance = int(match.group(2))
+        rotations.append(-distance if match.group(1) == "L" else distance)
+    return rotations
+
+
+def _read_rotations_numpy(data: bytes):
+    """
+    Fast path for clean input: one "L"/"R" plus 1-18 digits per line, "\n"
+    line ends, nothing else. Returns None for anything else (blank lines,
+    spaces, "\r", bad tokens), which then goes through parse_rotations.
+    """
+    if data.translate(None, b"0123456789LR\n"):
+        return None
+    chars = np.frombuffer(data, dtype=np.uint8)
+    starts = np.flatnonzero(chars >= ord("L"))  # "L" and "R" are the only bytes above the digits
+    ends = np.flatnonzero(chars == ord("\n"))
+    if len(chars) and chars[-1] != ord("\n"):
+        ends = np.append(ends, len(chars))
+    if len(starts) != len(ends):
+        return None
+    if not len(starts):
+        return np.zeros(0, dtype=np.int64)
+    digits = ends - starts - 1
+    longest = int(digits.max())
+    # Every line: its letter right after the previous line end, then the digits
+    if digits.min() < 1 or longest > MAX_DIGITS or starts[0] != 0 or (starts[1:] != ends[:-1] + 1).any():
+        return None
+    # Horner's rule, one digit column at a time, over the lines that are long enough
+    rotations = np.zeros(len(starts), dtype=np.int64)
+    for k in range(1, longest + 1):
+        longer = digits >= k
+        rotations[longer] = rotations[longer] * 10 + (chars[starts[longer] + k] - ord("0"))
+    np.negative(rotations, out=rotations, where=chars[starts] == ord("L"))
+    return rotations
+
+
+def as_array(rotations):
+    """Signed distances as an int64 array, from an array or any iterable (generators too)."""
+    if isinstance(rotations, np.ndarray):
+        return rotations.astype(np.int64, copy=False)
+    return np.fromiter(rotations, dtype=np.int64)
+
+
+def read_rotations(filename: str):
+    """
+    Signed rotation distances in one go: an int64 array with numpy, a list
+    without. Raises ValueError on malformed input.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    if np is None:
+        return parse_rotations(data.decode())
+    rotations = _read_rotations_numpy(data)
+    if rotations is None:
+        rotations = np.array(parse_rotations(data.decode()), dtype=np.int64)
+    return rotations
@@ -0,0 +1,64 @@
+"""
+Puzzle 01 - Exercise 01 tests
+
+The batch positions and zero-stop count against a rotation-by-rotation
+walk through dial() on random input. Run with `python -m pytest` or
+`python -m unittest`.
+"""
+
+import contextlib
+import io
+import random
+import unittest
+
+from exercise_01 import Direction, Vector, count_zero_stops, dial, positions
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def walk(rotations, start):
+    """Reference: every position dial() reports, one rotation at a time."""
+    position, visited = start, []
+    with contextlib.redirect_stdout(io.StringIO()):  # dial() prints every step
+        for distance in rotations:
+            direction = Direction.LEFT if distance < 0 else Direction.RIGHT
+            position = dial(position, Vector(direction, abs(distance)))
+            visited.append(position)
+    return visited
+
+
+class BatchPathTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def random_rotations(self):
+        return [self.rng.choice([1, -1]) * self.rng.randint(0, 1000) for _ in range(self.rng.randint(0, 200))]
+
+    def test_positions_match_dial(self):
+        for _ in range(100):
+            start = self.rng.randrange(100)
+            rotations = self.random_rotations()
+            expected = walk(rotations, start)
+            self.assertEqual([int(p) for p in positions(rotations, start)], expected)
+            self.assertEqual(count_zero_stops(rotations, start), expected.count(0))
+
+    def test_generator_input(self):
+        for _ in range(100):
+            start = self.rng.randrange(100)
+            rotations = self.random_rotations()
+            self.assertEqual(count_zero_stops((d for d in rotations), start), walk(rotations, start).count(0))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_array_input(self):
+        for _ in range(100):
+            start = self.rng.randrange(100)
+            rotations = self.random_rotations()
+            self.assertEqual(count_zero_stops(np.array(rotations, dtype=np.int64), start),
+                             walk(rotations, start).count(0))
+
+
+if __name__ == "__main__":
+    unittest.main()
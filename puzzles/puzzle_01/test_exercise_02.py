@@ -0,0 +1,113 @@
+"""
+Puzzle 01 - Exercise 02 tests
+
+The closed-form zero-click counting against a click-by-click simulation
+on random input. Run with `python -m pytest` or `python -m unittest`.
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from exercise_02 import count_zero_clicks, zero_click_step, zero_crossings
+from rotations import parse_rotations, read_rotations
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def simulate_clicks(position, distance):
+    """Brute force: turn the dial one click at a time; (new position, clicks on 0)."""
+    step = 1 if distance > 0 else -1
+    clicks = 0
+    for _ in range(abs(distance)):
+        position = (position + step) % 100
+        clicks += position == 0
+    return position, clicks
+
+
+def simulate_stream(rotations, start):
+    position, total = start, 0
+    for distance in rotations:
+        position, clicks = simulate_clicks(position, distance)
+        total += clicks
+    return total
+
+
+class ZeroClickTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def random_rotations(self):
+        return [self.rng.choice([1, -1]) * self.rng.randint(0, 1000) for _ in range(self.rng.randint(0, 200))]
+
+    def test_single_step_matches_simulation(self):
+        for _ in range(2000):
+            position = self.rng.randrange(100)
+            # Mostly small turns, some exactly on multiples of 100, some large
+            distance = self.rng.choice([self.rng.randint(0, 250), 100 * self.rng.randint(0, 50),
+                                        self.rng.randint(0, 100_000)])
+            distance *= self.rng.choice([1, -1])
+            self.assertEqual(zero_click_step(position, distance), simulate_clicks(position, distance),
+                             (position, distance))
+
+    def test_stream_matches_simulation(self):
+        for _ in range(100):
+            start = self.rng.randrange(100)
+            rotations = self.random_rotations()
+            expected = simulate_stream(rotations, start)
+            self.assertEqual(sum(clicks for _, clicks in zero_crossings(rotations, start)), expected)
+            self.assertEqual(count_zero_clicks(rotations, start), expected)
+
+    def test_generator_input(self):
+        for _ in range(100):
+            start = self.rng.randrange(100)
+            rotations = self.random_rotations()
+            self.assertEqual(count_zero_clicks((d for d in rotations), start), simulate_stream(rotations, start))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_array_input(self):
+        for _ in range(100):
+            start = self.rng.randrange(100)
+            rotations = self.random_rotations()
+            self.assertEqual(count_zero_clicks(np.array(rotations, dtype=np.int64), start),
+                             simulate_stream(rotations, start))
+
+
+class ParseRotationsTest(unittest.TestCase):
+    def test_signed_distances(self):
+        self.assertEqual(parse_rotations("R5\r\n\n  L30 \nR0"), [5, -30, 0])
+
+    def test_malformed_line_raises(self):
+        for text in ("R5\nX3\n", "R5 L3\n", "R\n", "5\n"):
+            with self.assertRaises(ValueError):
+                parse_rotations(text)
+
+    def read(self, text):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(text)
+        try:
+            return list(read_rotations(f.name))
+        finally:
+            os.remove(f.name)
+
+    def test_read_rotations(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            # Up to 18 digits takes the vectorised path with numpy, 10**18 itself the line parser
+            rotations = [rng.choice([1, -1]) * rng.randint(0, 10 ** rng.randint(1, 18)) for _ in range(20)]
+            text = "".join(f"{'L' if d < 0 else 'R'}{abs(d)}\n" for d in rotations)
+            self.assertEqual(self.read(text), rotations)
+        self.assertEqual(self.read("R5\r\n\nL30"), [5, -30])
+
+    def test_read_rotations_malformed_raises(self):
+        for text in ("R5\nX3\n", "R5L3\n", "R\n", "R5\n5\n"):
+            with self.assertRaises(ValueError):
+                self.read(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
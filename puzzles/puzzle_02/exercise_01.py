@@ -2,6 +2,9 @@
 Puzzle 02 - Exercise 01
 """
 
+from invalid_ids import MODE_TWICE, pattern_interval
+from range_index import RangeIndex
+
 
 def load_id_ranges(filename):
     """Load id-ranges from a file.
@@ -49,14 +52,27 @@ def is_invalid_id(id_num):
     return first_half == second_half
 
 
+def repeated_ids(first, last):
+    """Generate the invalid IDs in [first, last] in increasing order.
+    
+    A 2L-digit ID made of an L-digit pattern repeated twice is
+    pattern * (10^L + 1), so only the patterns whose multiple falls in the
+    range are visited: the cost is the number of hits, not the range width.
+    """
+    for digits in range(len(str(first)), len(str(last)) + 1):
+        if digits % 2 != 0:
+            continue
+        multiplier, lowest, highest = pattern_interval(digits, digits // 2, first, last)
+        for pattern in range(lowest, highest + 1):
+            yield pattern * multiplier
+
+
 def find_invalid_ids(ranges):
     """Find all invalid IDs in the given ranges."""
     invalid = []
     
     for first, last in ranges:
-        for id_num in range(first, last + 1):
-            if is_invalid_id(id_num):
-                invalid.append(id_num)
+        invalid.extend(repeated_ids(first, last))
     
     return invalid
 
@@ -68,11 +84,10 @@ def solve():
     for first, last in ranges:
         print(f"  {first}-{last}")
     
-    invalid_ids = find_invalid_ids(ranges)
-    total = sum(invalid_ids)
+    index = RangeIndex(ranges, MODE_TWICE)
     
-    print(f"\nInvalid IDs: {invalid_ids}")
-    print(f"Total sum: {total}")
+    print(f"\nInvalid IDs: {index.total_count}")
+    print(f"Total sum: {index.total_sum}")
 
 
 if __name__ == "__main__":
@@ -2,6 +2,11 @@
 Puzzle 02 - Exercise 01
 """
 
+import heapq
+
+from invalid_ids import MODE_REPEATED, pattern_interval
+from range_index import RangeIndex
+
 
 def load_id_ranges(filename):
     """Load id-ranges from a file.
@@ -52,14 +57,40 @@ def is_invalid_id(id_num):
 
 
 
+def pattern_multiples(digits, pattern_length, first, last):
+    """IDs in [first, last] with `digits` digits made of one pattern_length-digit pattern repeated.
+    
+    Such an ID is pattern * (10^digits - 1) / (10^pattern_length - 1), the
+    multiplier being 1 followed by pattern_length-digit blocks "0..01".
+    """
+    multiplier, lowest, highest = pattern_interval(digits, pattern_length, first, last)
+    return (pattern * multiplier for pattern in range(lowest, highest + 1))
+
+
+def repeated_ids(first, last):
+    """Generate the invalid IDs in [first, last] in increasing order.
+    
+    Only repeated-pattern numbers are visited, so the cost is the number of
+    hits, not the range width. An ID like 111111 is a repetition of 1, 11
+    and 111; merging the sorted streams of all pattern lengths and skipping
+    equal neighbours yields it once.
+    """
+    for digits in range(len(str(first)), len(str(last)) + 1):
+        streams = [pattern_multiples(digits, pattern_length, first, last)
+                   for pattern_length in range(1, digits // 2 + 1) if digits % pattern_length == 0]
+        previous = None
+        for id_num in heapq.merge(*streams):
+            if id_num != previous:
+                yield id_num
+            previous = id_num
+
+
 def find_invalid_ids(ranges):
     """Find all invalid IDs in the given ranges."""
     invalid = []
     
     for first, last in ranges:
-        for id_num in range(first, last + 1):
-            if is_invalid_id(id_num):
-                invalid.append(id_num)
+        invalid.extend(repeated_ids(first, last))
     
     return invalid
 
@@ -71,11 +102,10 @@ def solve():
     for first, last in ranges:
         print(f"  {first}-{last}")
     
-    invalid_ids = find_invalid_ids(ranges)
-    total = sum(invalid_ids)
+    index = RangeIndex(ranges, MODE_REPEATED)
     
-    print(f"\nInvalid IDs: {invalid_ids}")
-    print(f"Total sum: {total}")
+    print(f"\nInvalid IDs: {index.total_count}")
+    print(f"Total sum: {index.total_sum}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+"""
+Puzzle 02 - Invalid ID arithmetic
+
+Closed forms shared by both exercises. An ID of D digits made of an
+L-digit pattern repeated D/L times is pattern * (10^D - 1) / (10^L - 1).
+The patterns whose multiple lands in [first, last] form one contiguous
+interval, so the count and sum of those IDs is an arithmetic series times
+that multiplier.
+
+Modes:
+- MODE_TWICE: a pattern repeated exactly twice (exercise 01)
+- MODE_REPEATED: a pattern repeated at least twice (exercise 02)
+"""
+
+MODE_TWICE = "twice"
+MODE_REPEATED = "repeated"
+
+
+def prime_factors(n):
+    """Distinct prime factors of n, ascending."""
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def block_weights(digits, mode):
+    """Pattern lengths to add up for IDs of `digits` digits, as [(pattern_length, sign), ...].
+
+    In MODE_REPEATED the IDs repeating an L-block are exactly those whose
+    smallest period divides L, so the union over all proper divisors L is the
+    union over the maximal ones, digits / p for each prime p. Intersections
+    are again block sets (digits / (p * q), ...), which gives Moebius-style
+    inclusion-exclusion: 111111 is added for 6/2 and 6/3 and removed for 6/6.
+    """
+    if mode == MODE_TWICE:
+        return [(digits // 2, 1)] if digits % 2 == 0 else []
+    if mode != MODE_REPEATED:
+        raise ValueError(f"Unknown mode {mode!r}")
+    weights = []
+    primes = prime_factors(digits)
+    for subset in range(1, 1 << len(primes)):
+        product = 1
+        for i, p in enumerate(primes):
+            if subset >> i & 1:
+                product *= p
+        sign = 1 if bin(subset).count("1") % 2 else -1
+        weights.append((digits // product, sign))
+    return weights
+
+
+def pattern_interval(digits, pattern_length, first, last):
+    """
+    (multiplier, lowest, highest): the `digits`-digit IDs in [first, last]
+    repeating one pattern_length-digit block are pattern * multiplier for
+    lowest <= pattern <= highest (empty when lowest > highest).
+    """
+    multiplier = (10 ** digits - 1) // (10 ** pattern_length - 1)
+    lowest = max(10 ** (pattern_length - 1), -(-first // multiplier))
+    highest = min(10 ** pattern_length - 1, last // multiplier)
+    return multiplier, lowest, highest
+
+
+def pattern_series(digits, pattern_length, first, last):
+    """Count and sum of the `digits`-digit IDs in [first, last] repeating one pattern_length-digit block."""
+    multiplier, lowest, highest = pattern_interval(digits, pattern_length, first, last)
+    if lowest > highest:
+        return 0, 0
+    count = highest - lowest + 1
+    return count, multiplier * (lowest + highest) * count // 2
+
+
+def count_and_sum_invalid_in_range(first, last, mode):
+    """(count, sum) of the invalid IDs in [first, last], without enumerating them."""
+    count = total = 0
+    for digits in range(len(str(max(first, 1))), len(str(max(last, 1))) + 1):
+        for pattern_length, sign in block_weights(digits, mode):
+            n, s = pattern_series(digits, pattern_length, first, last)
+            count += sign * n
+            total += sign * s
+    return count, total
+
+
+def sum_invalid_in_range(first, last, mode=MODE_TWICE):
+    """Sum of the invalid IDs in [first, last]."""
+    return count_and_sum_invalid_in_range(first, last, mode)[1]
+
+
+def count_invalid_in_range(first, last, mode=MODE_TWICE):
+    """Number of invalid IDs in [first, last]."""
+    return count_and_sum_invalid_in_range(first, last, mode)[0]
@@ -0,0 +1,104 @@
+"""
+Puzzle 02 - Range index
+
+Normalises a list of ID ranges once (sort, merge overlapping or adjacent
+ranges, split at digit-length boundaries 10^k) and precomputes cumulative
+invalid-ID counts and sums per segment, so "how many invalid IDs in [a, b]"
+against the same range set is two bisects plus at most two closed-form
+partial segments, whatever the number of ranges.
+
+Usage: python range_index.py <input file> [first-last ...]
+"""
+
+from bisect import bisect_left, bisect_right
+
+from invalid_ids import MODE_REPEATED, MODE_TWICE, count_and_sum_invalid_in_range
+
+
+def merge_ranges(ranges):
+    """Sorted, disjoint, non-adjacent (first, last) ranges covering the same IDs."""
+    merged = []
+    for first, last in sorted(ranges):
+        if first > last:
+            continue
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1] = (merged[-1][0], last)
+        else:
+            merged.append((first, last))
+    return merged
+
+
+def split_by_digits(ranges):
+    """Split every range so that all IDs of one piece have the same number of digits."""
+    pieces = []
+    for first, last in ranges:
+        while first <= last:
+            boundary = 10 ** len(str(first))
+            pieces.append((first, min(last, boundary - 1)))
+            first = boundary
+    return pieces
+
+
+class RangeIndex:
+    """Invalid-ID counts and sums over a fixed set of ranges, for one mode."""
+
+    def __init__(self, ranges, mode=MODE_TWICE):
+        self.mode = mode
+        self.segments = split_by_digits(merge_ranges(ranges))
+        self.starts = [first for first, _ in self.segments]
+        self.ends = [last for _, last in self.segments]
+        # prefix_counts[i] / prefix_sums[i]: totals over segments[:i]
+        self.prefix_counts = [0]
+        self.prefix_sums = [0]
+        for first, last in self.segments:
+            count, total = count_and_sum_invalid_in_range(first, last, mode)
+            self.prefix_counts.append(self.prefix_counts[-1] + count)
+            self.prefix_sums.append(self.prefix_sums[-1] + total)
+
+    @property
+    def total_count(self):
+        return self.prefix_counts[-1]
+
+    @property
+    def total_sum(self):
+        return self.prefix_sums[-1]
+
+    def query(self, a, b):
+        """(count, sum) of the invalid IDs in [a, b] that lie in one of the ranges."""
+        i = bisect_left(self.ends, a)       # first segment ending at or after a
+        j = bisect_right(self.starts, b) - 1  # last segment starting at or before b
+        if i > j:
+            return 0, 0
+        if i == j:
+            return count_and_sum_invalid_in_range(max(a, self.starts[i]), min(b, self.ends[i]), self.mode)
+        head = count_and_sum_invalid_in_range(max(a, self.starts[i]), self.ends[i], self.mode)
+        tail = count_and_sum_invalid_in_range(self.starts[j], min(b, self.ends[j]), self.mode)
+        count = head[0] + tail[0] + self.prefix_counts[j] - self.prefix_counts[i + 1]
+        total = head[1] + tail[1] + self.prefix_sums[j] - self.prefix_sums[i + 1]
+        return count, total
+
+    def count(self, a, b):
+        """Number of invalid IDs in [a, b] covered by the ranges."""
+        return self.query(a, b)[0]
+
+    def sum(self, a, b):
+        """Sum of the invalid IDs in [a, b] covered by the ranges."""
+        return self.query(a, b)[1]
+
+
+if __name__ == "__main__":
+    import sys
+
+    from exercise_01 import load_id_ranges
+
+    ranges = load_id_ranges(sys.argv[1] if len(sys.argv) > 1 else 'input.txt')
+    indexes = {mode: RangeIndex(ranges, mode) for mode in (MODE_TWICE, MODE_REPEATED)}
+    print(f"{len(ranges)} ranges -> {len(indexes[MODE_TWICE].segments)} segments")
+    for mode, index in indexes.items():
+        print(f"  {mode:>8}: {index.total_count} invalid IDs, sum {index.total_sum}")
+    for text in sys.argv[2:]:
+        a, b = map(int, text.split('-'))
+        for mode, index in indexes.items():
+            count, total = index.query(a, b)
+            print(f"  [{a}, {b}] {mode:>8}: {count} invalid IDs, sum {total}")
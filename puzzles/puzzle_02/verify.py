@@ -0,0 +1,137 @@
+"""
+Puzzle 02 - Brute-force verification
+
+Checks the closed-form totals of RangeIndex by testing every single ID.
+The merged ranges are split into fixed-size chunks that a process pool
+scans independently; the partial counts and sums are then added up.
+
+Per chunk, either the reference is_invalid_id of the exercise is called
+on every ID (--scalar), or, with numpy, the chunk becomes a digit array
+(one int8 row per digit position) and an ID repeats an L-digit block when
+its digits equal themselves shifted by L. Both only look at the digits, so
+they are independent of the pattern * multiplier arithmetic being checked.
+
+Usage: python verify.py [input file] [--ranges first-last ...] [--mode twice|repeated|both]
+                        [--workers N] [--chunk-size N] [--scalar] [--progress SECS]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import exercise_01
+import exercise_02
+from invalid_ids import MODE_REPEATED, MODE_TWICE
+from range_index import RangeIndex, merge_ranges, split_by_digits
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHECKS = {MODE_TWICE: exercise_01.is_invalid_id, MODE_REPEATED: exercise_02.is_invalid_id}
+
+
+def make_chunks(ranges, chunk_size):
+    """Merged ranges cut into pieces of at most chunk_size IDs, all of one digit length."""
+    chunks = []
+    for first, last in split_by_digits(merge_ranges(ranges)):
+        for start in range(first, last + 1, chunk_size):
+            chunks.append((start, min(last, start + chunk_size - 1)))
+    return chunks
+
+
+def scan_chunk_scalar(first, last, mode):
+    """(count, sum) of the invalid IDs in [first, last], one is_invalid_id call per ID."""
+    check = CHECKS[mode]
+    count = total = 0
+    for id_num in range(first, last + 1):
+        if check(id_num):
+            count += 1
+            total += id_num
+    return count, total
+
+
+def scan_chunk_numpy(first, last, mode):
+    """Same as scan_chunk_scalar on a (digits x IDs) digit array; all IDs must have the same length."""
+    digits = len(str(first))
+    if mode == MODE_TWICE:
+        block_lengths = [digits // 2] if digits % 2 == 0 else []
+    else:
+        block_lengths = [length for length in range(1, digits // 2 + 1) if digits % length == 0]
+    if not block_lengths:
+        return 0, 0
+    ids = np.arange(first, last + 1, dtype=np.int64)
+    digit_rows = np.empty((digits, len(ids)), dtype=np.int8)
+    for i in range(digits):
+        digit_rows[i] = ids // 10 ** (digits - 1 - i) % 10
+    invalid = np.zeros(len(ids), dtype=bool)
+    for length in block_lengths:
+        invalid |= (digit_rows[length:] == digit_rows[:-length]).all(axis=0)
+    hits = ids[invalid].tolist()
+    return len(hits), sum(hits)
+
+
+def scan_chunk(first, last, mode, scalar=False):
+    # int64 holds every ID below 2^63; anything larger goes through the reference check
+    if scalar or np is None or last >= 2**63:
+        return scan_chunk_scalar(first, last, mode)
+    return scan_chunk_numpy(first, last, mode)
+
+
+def brute_force(ranges, mode, workers=None, chunk_size=1 << 20, scalar=False, progress_secs=5.0):
+    """Scan all chunks on a process pool; returns (count, sum) over the merged ranges."""
+    chunks = make_chunks(ranges, chunk_size)
+    width = sum(last - first + 1 for first, last in chunks)
+    count = total = scanned = 0
+    start = last_report = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(scan_chunk, first, last, mode, scalar): last - first + 1
+                   for first, last in chunks}
+        for future in as_completed(futures):
+            chunk_count, chunk_total = future.result()
+            count += chunk_count
+            total += chunk_total
+            scanned += futures[future]
+            now = time.time()
+            if progress_secs and now - last_report >= progress_secs:
+                last_report = now
+                rate = scanned / (now - start)
+                eta = (width - scanned) / rate if rate else float("inf")
+                print(f"  [{mode}] {scanned:,}/{width:,} IDs ({100 * scanned / width:.1f}%), "
+                      f"{rate / 1e6:.1f}M IDs/s, ETA {eta:.0f}s", file=sys.stderr, flush=True)
+    return count, total
+
+
+def parse_range(text):
+    first, last = text.split('-')
+    return int(first), int(last)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Brute-force check of the puzzle 02 closed-form totals")
+    parser.add_argument("input", nargs="?", default="input.txt", help="puzzle input file")
+    parser.add_argument("--ranges", nargs="+", type=parse_range, default=None,
+                        help="check these first-last ranges instead of the input file")
+    parser.add_argument("--mode", choices=[MODE_TWICE, MODE_REPEATED, "both"], default="both")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1 << 20, help="IDs per task")
+    parser.add_argument("--scalar", action="store_true", help="call is_invalid_id per ID even with numpy")
+    parser.add_argument("--progress", type=float, default=5.0, metavar="SECS",
+                        help="report progress on stderr every SECS seconds (0 = off)")
+    args = parser.parse_args()
+
+    ranges = args.ranges or exercise_01.load_id_ranges(args.input)
+    modes = [MODE_TWICE, MODE_REPEATED] if args.mode == "both" else [args.mode]
+    failed = False
+    for mode in modes:
+        index = RangeIndex(ranges, mode)
+        start = time.time()
+        count, total = brute_force(ranges, mode, args.workers, args.chunk_size, args.scalar, args.progress)
+        ok = (count, total) == (index.total_count, index.total_sum)
+        failed |= not ok
+        print(f"{mode:>8}: brute force {count} IDs, sum {total} in {time.time() - start:.1f}s; "
+              f"closed form {index.total_count} IDs, sum {index.total_sum} {'✓' if ok else '✗'}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,179 @@
+"""
+Puzzle 12 - Solver benchmark
+
+Generates synthetic regions for the shapes of an input file, from loose
+to exactly tight (fill ratio = shape cells / board area), and runs every
+solve_region backend on them with a per-region timeout. Reports wall time,
+nodes and peak memory per backend and fill ratio, and can write the raw
+rows as CSV or JSON.
+
+Every pass starts from an empty placement cache, so all backends are
+timed from the same state (whichever runs first does not pay for the
+placements of the others) and placement generation is counted. Memory is
+measured in a separate pass, as in compare_dlx.py, since tracemalloc
+slows the solvers down considerably.
+
+Usage: python benchmark.py [input file] [--sizes 6x5 8x8] [--fills 0.6 0.8 1.0]
+                           [--per-fill N] [--backends dlx sat] [--timeout S]
+                           [--out results.csv|results.json] [--regions-out FILE]
+"""
+
+import argparse
+import csv
+import json
+import random
+import statistics
+import time
+import tracemalloc
+
+from exercise_01 import BACKENDS, clear_placement_tables, get_placement_table, read_shapes, solve_region
+
+FIELDS = ["fill", "width", "height", "counts", "demand", "backend", "status", "seconds", "nodes", "peak_mib"]
+
+
+def generate_regions(shapes, sizes, fills, per_fill, seed=0):
+    """
+    Random regions with shape demand as close to fill * area as possible
+    (never above it). Returns [(fill, width, height, counts), ...].
+    """
+    rng = random.Random(seed)
+    table = get_placement_table(shapes)
+    sids = sorted(shapes)
+    regions = []
+    for fill in fills:
+        for i in range(per_fill):
+            width, height = sizes[i % len(sizes)]
+            target = int(fill * width * height)
+            counts = [0] * (max(sids) + 1)
+            demand = 0
+            # Add random shapes while one still fits under the target
+            while True:
+                fitting = [sid for sid in sids if demand + table.cells[sid] <= target and table.fits(sid, width, height)]
+                if not fitting:
+                    break
+                sid = rng.choice(fitting)
+                counts[sid] += 1
+                demand += table.cells[sid]
+            regions.append((fill, width, height, counts))
+    return regions
+
+
+def run_backend(shapes, width, height, counts, backend, timeout_secs, memory=True, **options):
+    """Return (status, seconds, nodes, peak MiB or None) for one region and backend."""
+    tracker = {}
+    # Cold placement cache for every pass, so backend order does not matter
+    clear_placement_tables()
+    start = time.time()
+    solve_region(shapes, width, height, counts, backend, tracker=tracker, timeout_secs=timeout_secs, **options)
+    seconds = time.time() - start
+
+    peak = None
+    if memory:
+        # Cold again, so the peak includes generating the placements
+        clear_placement_tables()
+        tracemalloc.start()
+        solve_region(shapes, width, height, counts, backend, timeout_secs=timeout_secs, **options)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak /= 2**20
+    return tracker.get("status"), seconds, tracker.get("nodes", 0), peak
+
+
+def benchmark(shapes, regions, backends, timeout_secs=5.0, memory=True, symmetry=False):
+    """Run every backend on every region; returns one row (dict) per run."""
+    table = get_placement_table(shapes)
+    rows = []
+    for idx, (fill, width, height, counts) in enumerate(regions):
+        demand = sum(table.cells[sid] * cnt for sid, cnt in enumerate(counts))
+        for backend in backends:
+            options = {"symmetry": symmetry} if backend == "dlx" else {}
+            status, seconds, nodes, peak = run_backend(shapes, width, height, counts, backend, timeout_secs,
+                                                       memory, bitboard=True, **options)
+            rows.append({
+                "fill": fill, "width": width, "height": height, "counts": " ".join(map(str, counts)),
+                "demand": demand, "backend": backend, "status": status, "seconds": round(seconds, 4),
+                "nodes": nodes, "peak_mib": round(peak, 2) if peak is not None else None,
+            })
+            print(f"  #{idx + 1} {width}x{height} fill {fill:.2f} {backend:>11}: {status:<16} "
+                  f"{seconds:7.2f}s {nodes:>9} nodes", flush=True)
+    return rows
+
+
+def summarize(rows):
+    """Per (backend, fill) aggregates, in order of first appearance."""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["backend"], row["fill"]), []).append(row)
+    summary = []
+    for (backend, fill), group in groups.items():
+        seconds = [r["seconds"] for r in group]
+        peaks = [r["peak_mib"] for r in group if r["peak_mib"] is not None]
+        summary.append({
+            "backend": backend, "fill": fill, "runs": len(group),
+            "solved": sum(r["status"] == "SOLVED" for r in group),
+            "impossible": sum(r["status"] == "IMPOSSIBLE" for r in group),
+            "unknown": sum(r["status"] == "BUDGET_EXHAUSTED" for r in group),
+            "mean_seconds": round(statistics.mean(seconds), 4),
+            "median_seconds": round(statistics.median(seconds), 4),
+            "max_seconds": round(max(seconds), 4),
+            "mean_nodes": round(statistics.mean(r["nodes"] for r in group)),
+            "max_peak_mib": max(peaks) if peaks else None,
+        })
+    return summary
+
+
+def write_results(path, rows, summary):
+    """CSV (raw rows) or JSON (rows and summary), picked by file extension."""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump({"rows": rows, "summary": summary}, f, indent=1)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the puzzle 12 solver backends")
+    parser.add_argument("input", nargs="?", default="./input_12.txt", help="puzzle input file (shapes)")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[(6, 5), (8, 6), (10, 8)],
+                        help="board sizes WxH, used round-robin")
+    parser.add_argument("--fills", nargs="+", type=float, default=[0.5, 0.7, 0.8, 0.9, 1.0],
+                        help="fill ratios (shape cells / area)")
+    parser.add_argument("--per-fill", type=int, default=3, help="regions per fill ratio")
+    parser.add_argument("--backends", nargs="+", choices=sorted(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--timeout", type=float, default=5.0, help="per region and backend, seconds")
+    parser.add_argument("--symmetry", action="store_true", help="dlx: break symmetry between copies")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="write rows to .csv, or rows and summary to .json")
+    parser.add_argument("--regions-out", default=None, help="also write the generated region lines")
+    args = parser.parse_args()
+
+    shapes = read_shapes(args.input)
+    regions = generate_regions(shapes, args.sizes, args.fills, args.per_fill, args.seed)
+    if args.regions_out:
+        with open(args.regions_out, "w") as f:
+            for _, width, height, counts in regions:
+                f.write(f"{width}x{height}: {' '.join(map(str, counts))}\n")
+
+    print(f"Benchmarking {len(regions)} regions x {len(args.backends)} backends (timeout {args.timeout}s)")
+    rows = benchmark(shapes, regions, args.backends, args.timeout, not args.no_memory, args.symmetry)
+    summary = summarize(rows)
+
+    print(f"\n{'backend':>11} {'fill':>5} {'runs':>4} {'yes':>4} {'no':>4} {'?':>4} "
+          f"{'mean s':>8} {'median s':>8} {'max s':>8} {'nodes':>9} {'peak MiB':>8}")
+    for s in summary:
+        peak = f"{s['max_peak_mib']:8.1f}" if s["max_peak_mib"] is not None else f"{'-':>8}"
+        print(f"{s['backend']:>11} {s['fill']:5.2f} {s['runs']:>4} {s['solved']:>4} {s['impossible']:>4} "
+              f"{s['unknown']:>4} {s['mean_seconds']:8.3f} {s['median_seconds']:8.3f} {s['max_seconds']:8.3f} "
+              f"{s['mean_nodes']:>9} {peak}")
+    if args.out:
+        write_results(args.out, rows, summary)
+        print(f"\nWrote {len(rows)} rows to {args.out}")
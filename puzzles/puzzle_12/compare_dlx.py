@@ -0,0 +1,62 @@
+"""
+Puzzle 12 - DLX vs ArrayDLX comparison
+
+Builds the bitboard exact cover matrix of a few regions with both DLX
+implementations and reports build time, search time and peak memory.
+Memory is measured in a separate pass because tracemalloc slows down the
+build considerably.
+
+Usage: python compare_dlx.py [input file] [--regions N] [--full-cover]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from exercise_01 import DLX, ArrayDLX, build_dlx, classify_region, stream_input
+
+
+def measure(shapes, width, height, counts, dlx_class, require_full_cover=False):
+    """Return (build seconds, search seconds, solved, peak MiB) for one region."""
+    start = time.time()
+    dlx = build_dlx(shapes, width, height, counts, require_full_cover, bitboard=True, dlx_class=dlx_class)
+    build_time = time.time() - start
+
+    start = time.time()
+    solved = bool(dlx.search(max_solutions=1))
+    search_time = time.time() - start
+    del dlx
+
+    tracemalloc.start()
+    dlx = build_dlx(shapes, width, height, counts, require_full_cover, bitboard=True, dlx_class=dlx_class)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del dlx
+
+    return build_time, search_time, solved, peak / 2**20
+
+
+def compare(file_path="./input_12.txt", max_regions=1, require_full_cover=False):
+    shapes, regions = stream_input(file_path)
+
+    # Only EASY_YES regions: they have a packing, so search() terminates
+    picked = [(idx, region) for idx, region in enumerate(regions)
+              if classify_region(shapes, *region) == "EASY_YES"][:max_regions]
+
+    print(f"{'region':>14} {'class':>9} {'build s':>9} {'search s':>9} {'peak MiB':>9}")
+    for idx, (width, height, counts) in picked:
+        for dlx_class in (DLX, ArrayDLX):
+            build_time, search_time, solved, peak = measure(shapes, width, height, counts, dlx_class,
+                                                            require_full_cover)
+            label = f"#{idx + 1} {width}x{height}"
+            mark = "✓" if solved else "✗"
+            print(f"{label:>14} {dlx_class.__name__:>9} {build_time:9.2f} {search_time:9.2f} {peak:9.1f} {mark}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare DLX and ArrayDLX")
+    parser.add_argument("input", nargs="?", default="./input_12.txt", help="puzzle input file")
+    parser.add_argument("--regions", type=int, default=1, help="number of EASY_YES regions to compare")
+    parser.add_argument("--full-cover", action="store_true", help="also add one column per cell")
+    args = parser.parse_args()
+    compare(args.input, args.regions, args.full_cover)
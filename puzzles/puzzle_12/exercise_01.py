@@ -7,71 +7,115 @@ can be placed on a rectangular board without overlapping. Using Algorithm X
 - MRV heuristic: pick constraint with fewest candidates
 - Cell index: quickly find conflicting candidates
 - Constraint index: avoid linear scans
+- Optional bitboard mode: placements as ints, overlap as a single `&`
 
 Rotations and reflections are allowed.
 
 But still too slow ...
 """
 
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 
-def read_shapes(file_path):
-    """
-    Read the shape definitions from the input file.
-    Returns a dictionary where keys are shape numbers (0-5) and values are 3x3 matrices.
-    """
-    shapes = {}
+from sat_backend import solve_packing
+from solution_file import write_solutions
 
-    with open(file_path, "r") as f:
-        lines = f.readlines()
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+# --- Input parsing ---
+# One pass over the file: shape blocks ("N:" followed by rows of '#'/'.')
+# come first, then one region per line ("WxH: c0 c1 ..."). Regions are
+# yielded lazily so callers can start on them while the rest is read.
 
-        if line and line[-1] == ":" and line[0].isdigit():
-            shape_num = int(line[:-1])
-            shape_matrix = []
+SHAPE_HEADER = re.compile(r"^(\d+):$")
+SHAPE_ROW = re.compile(r"^[#.]+$")
+REGION_LINE = re.compile(r"^(\d+)x(\d+):((?:\s+\d+)*)$")
 
-            for j in range(1, 4):
-                if i + j < len(lines):
-                    row = lines[i + j].rstrip("\n")
-                    row = (row + "...")[:3]
-                    shape_matrix.append(row)
 
-            shapes[shape_num] = shape_matrix
-            i += 4
-        elif line and any(c.isdigit() for c in line) and "x" in line:
-            break
+def _read_shape_blocks(lines):
+    """
+    Consume (line number, line) pairs up to the first region line.
+    Returns (shapes, first non-shape pair or None).
+    """
+    shapes = {}
+    shape_num = None
+    for line_no, raw in lines:
+        line = raw.strip()
+        header = SHAPE_HEADER.match(line)
+        if header:
+            shape_num = int(header.group(1))
+            shapes[shape_num] = []
+        elif line and SHAPE_ROW.match(line) and shape_num is not None:
+            shapes[shape_num].append((raw.rstrip("\n") + "...")[:3])
+        elif not line:
+            shape_num = None
         else:
-            i += 1
-
-    return shapes
+            return shapes, (line_no, raw)
+    return shapes, None
 
 
-def read_regions(file_path):
+def stream_input(file_path, malformed=None):
     """
-    Read the region definitions from the input file.
-    Returns a list of tuples: [(width, height, [count0, count1, ..., count5]), ...]
+    Parse the input in a single pass.
+    Returns (shapes, regions): shapes is complete (dict as read_shapes),
+    regions is a generator of (width, height, counts) reading the rest of
+    the file on demand.
+    malformed: list receiving (line number, line) for every line that is
+    neither blank, a shape block nor a valid region line (with the wrong
+    number of counts included); those lines are skipped. Without it a
+    malformed line raises ValueError.
     """
-    regions = []
+    f = open(file_path, "r")
+    lines = enumerate(f, start=1)
+    try:
+        shapes, first_region = _read_shape_blocks(lines)
+    except BaseException:
+        f.close()
+        raise
 
-    with open(file_path, "r") as f:
-        lines = f.readlines()
+    def regions():
+        with f:
+            pending = [first_region] if first_region else []
+            for line_no, raw in itertools.chain(pending, lines):
+                line = raw.strip()
+                if not line:
+                    continue
+                match = REGION_LINE.match(line)
+                counts = [int(c) for c in match.group(3).split()] if match else None
+                if counts is None or len(counts) != len(shapes):
+                    if malformed is None:
+                        raise ValueError(f"{file_path}:{line_no}: malformed line {line!r}")
+                    malformed.append((line_no, line))
+                    continue
+                yield int(match.group(1)), int(match.group(2)), counts
 
-    for i, line in enumerate(lines):
-        line = line.strip()
+    return shapes, regions()
 
-        if "x" in line and ":" in line:
-            parts = line.split(":")
-            dimensions = parts[0].strip().split("x")
-            width, height = int(dimensions[0]), int(dimensions[1])
 
-            counts_str = parts[1].strip().split()
-            counts = [int(c) for c in counts_str]
+def read_shapes(file_path):
+    """
+    Read the shape definitions from the input file.
+    Returns a dictionary where keys are shape numbers (0-5) and values are 3x3 matrices.
+    """
+    with open(file_path, "r") as f:
+        return _read_shape_blocks(enumerate(f, start=1))[0]
 
-            regions.append((width, height, counts))
 
-    return regions
+def read_regions(file_path, malformed=None):
+    """
+    Read the region definitions from the input file.
+    Returns a list of tuples: [(width, height, [count0, count1, ..., count5]), ...]
+    """
+    return list(stream_input(file_path, malformed)[1])
 
 
 def shape_to_coords(shape_matrix):
@@ -132,165 +176,304 @@ def generate_placements(shape_coords, width, height):
     return placements
 
 
-def build_exact_cover_problem(shapes, width, height, shape_counts):
-    """Build the constraint system for exact cover."""
+# --- Bitboard placements ---
+# A placement can also be stored as a single int over the width*height board,
+# with bit (row * width + col) set for every covered cell. Overlap between two
+# placements is then a single `a & b`.
+
+def coords_to_mask(coords, width):
+    """Pack a set of (row, col) coordinates into a bitboard int."""
+    mask = 0
+    for r, c in coords:
+        mask |= 1 << (r * width + c)
+    return mask
+
+
+def mask_bits(mask):
+    """Indices of the set bits of a bitboard, lowest first."""
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    return bits
+
+
+def mask_to_coords(mask, width):
+    """Unpack a bitboard int back into a set of (row, col) coordinates."""
+    coords = set()
+    while mask:
+        low = mask & -mask
+        coords.add(divmod(low.bit_length() - 1, width))
+        mask ^= low
+    return coords
+
+
+def shapes_signature(shapes):
+    """Stable hash of a shape set (ids and matrices)."""
+    text = "\n".join(f"{sid}:" + "/".join(shapes[sid]) for sid in sorted(shapes))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+@dataclass
+class BoardPlacements:
+    """Placement caches of one board size, keyed by shape id (pair_fits: by shape id pair)."""
+    masks: dict = field(default_factory=dict)  # sid -> [bitboard, ...]
+    info: dict = field(default_factory=dict)  # sid -> [(orientation, row, col), ...] parallel to masks
+    coords: dict = field(default_factory=dict)  # sid -> [{(row, col), ...}, ...] parallel to masks
+    scan_order: dict = field(default_factory=dict)  # sid -> masks sorted by first covered cell
+    pair_fits: dict = field(default_factory=dict)  # (sid_a, sid_b) -> bool
+
+
+# Board sizes whose placements a PlacementTable keeps (least recently used go first)
+MAX_CACHED_BOARDS = 16
+
+
+class PlacementTable:
+    """
+    Orientations and placements of a shape set, computed once and shared.
+
+    Orientations are computed once per shape (in a stable order, so an
+    orientation index means the same thing in every process). Placement
+    lists are generated once per (shape, width, height) and shared by every
+    copy of the shape and every region with the same board size. Each
+    placement is stored as a bitboard; placement_info() gives the compact
+    (orientation index, row offset, col offset) form.
+
+    Placements are kept per board size (BoardPlacements) for the max_boards
+    most recently used sizes; a large board holds tens of MiB of them.
+    """
+    def __init__(self, shapes, max_boards=MAX_CACHED_BOARDS):
+        self.shapes = shapes
+        self.orientations = {
+            sid: sorted(get_all_orientations(matrix), key=sorted) for sid, matrix in shapes.items()
+        }
+        self.cells = {sid: shape_cell_count(matrix) for sid, matrix in shapes.items()}
+        self.max_boards = max_boards
+        self._boards = OrderedDict()  # (width, height) -> BoardPlacements
+
+    def board(self, width, height):
+        """Placement caches of a width x height board (LRU over board sizes)."""
+        key = (width, height)
+        board = self._boards.get(key)
+        if board is None:
+            board = self._boards[key] = BoardPlacements()
+            while len(self._boards) > self.max_boards:
+                self._boards.popitem(last=False)
+        else:
+            self._boards.move_to_end(key)
+        return board
+
+    def masks(self, sid, width, height):
+        """All placements of shape sid on a width x height board, as bitboards."""
+        board = self.board(width, height)
+        if sid not in board.masks:
+            masks = []
+            info = []
+            for ori_idx, orient in enumerate(self.orientations[sid]):
+                shape_height = max(r for r, c in orient) + 1
+                shape_width = max(c for r, c in orient) + 1
+                base = coords_to_mask(orient, width)
+                for row_offset in range(height - shape_height + 1):
+                    for col_offset in range(width - shape_width + 1):
+                        masks.append(base << (row_offset * width + col_offset))
+                        info.append((ori_idx, row_offset, col_offset))
+            board.masks[sid] = masks
+            board.info[sid] = info
+        return board.masks[sid]
+
+    def placement_info(self, sid, width, height):
+        """(orientation index, row offset, col offset) per entry of masks()."""
+        self.masks(sid, width, height)
+        return self.board(width, height).info[sid]
+
+    def locate(self, sid, width, height, mask):
+        """
+        (orientation index, row offset, col offset) of one placement bitboard.
+        The offset follows from the lowest set bit, so this needs no placement
+        list of the board; raises KeyError if mask is no placement of sid.
+        """
+        low = (mask & -mask).bit_length()
+        for ori_idx, orient in enumerate(self.orientations[sid]):
+            base = coords_to_mask(orient, width)
+            shift = low - (base & -base).bit_length()
+            if shift < 0 or base << shift != mask:
+                continue
+            row_offset, col_offset = divmod(shift, width)
+            if (row_offset + max(r for r, c in orient) < height
+                    and col_offset + max(c for r, c in orient) < width):
+                return ori_idx, row_offset, col_offset
+        raise KeyError(mask)
+
+    def coord_placements(self, sid, width, height):
+        """Same placements as masks(), as sets of (row, col) (set-based solvers)."""
+        board = self.board(width, height)
+        if sid not in board.coords:
+            board.coords[sid] = [mask_to_coords(m, width) for m in self.masks(sid, width, height)]
+        return board.coords[sid]
+
+    def scan_order_masks(self, sid, width, height):
+        """masks() sorted by first covered cell in scan order (constructive packers)."""
+        board = self.board(width, height)
+        if sid not in board.scan_order:
+            board.scan_order[sid] = sorted(self.masks(sid, width, height), key=lambda m: ((m & -m).bit_length(), m))
+        return board.scan_order[sid]
+
+    def fit_together(self, sid_a, sid_b, width, height):
+        """True if one copy of each shape fits on a width x height board without overlap."""
+        board = self.board(width, height)
+        if (sid_a, sid_b) not in board.pair_fits:
+            masks_b = self.masks(sid_b, width, height)
+            board.pair_fits[(sid_a, sid_b)] = any(not a & b for a in self.masks(sid_a, width, height)
+                                                  for b in masks_b)
+        return board.pair_fits[(sid_a, sid_b)]
+
+    def fits(self, sid, width, height):
+        """True if some orientation of shape sid fits a width x height board."""
+        return any(max(r for r, c in o) < height and max(c for r, c in o) < width
+                   for o in self.orientations[sid])
+
+
+_placement_tables = {}
+
+
+def get_placement_table(shapes):
+    """Process-wide PlacementTable for a shape set (shared across regions)."""
+    key = shapes_signature(shapes)
+    if key not in _placement_tables:
+        _placement_tables[key] = PlacementTable(shapes)
+    return _placement_tables[key]
+
+
+def clear_placement_tables():
+    """Drop every cached PlacementTable (the next solve starts from a cold cache)."""
+    _placement_tables.clear()
+
+
+def build_exact_cover_problem(shapes, width, height, shape_counts, bitboard=False):
+    """
+    Build the constraint system for exact cover.
+    With bitboard=True every placement is a bitboard int instead of a set.
+    """
     
     candidates = []
     shape_constraints = set()
-    max_placements_per_instance = 10000  # Hard limit per instance
+    table = get_placement_table(shapes)
     
     for shape_id, count in enumerate(shape_counts):
         if count == 0:
             continue
             
-        shape_matrix = shapes[shape_id]
-        orientations = get_all_orientations(shape_matrix)
+        if bitboard:
+            placements = table.masks(shape_id, width, height)
+        else:
+            placements = table.coord_placements(shape_id, width, height)
         
         for instance_id in range(count):
             shape_constraints.add((shape_id, instance_id))
-            placement_count = 0
-            
-            for orientation in orientations:
-                placements = generate_placements(orientation, width, height)
-                
-                for placement in placements:
-                    if placement_count < max_placements_per_instance:
-                        candidates.append((shape_id, instance_id, placement))
-                        placement_count += 1
-                    else:
-                        break
-            if placement_count >= max_placements_per_instance:
-                break
+            for placement in placements:
+                candidates.append((shape_id, instance_id, placement))
     return candidates, shape_constraints
 
 
-def algorithm_x(candidates, shape_constraints, solution=None, depth=0, tracker=None, progress_cb=None, 
-                constraint_index=None, cell_index=None, max_depth=80, timeout_secs=2, start_time=None):
+def algorithm_x(candidates, shape_constraints, tracker=None, progress_cb=None, max_depth=80, timeout_secs=2):
     """
-    Solve exact cover using Algorithm X with VERY aggressive limits:
-    - Early infeasibility detection: backtrack if any constraint has 0 candidates
-    - VERY STRICT depth limit (80) and timeout (2s) for fast rejection
+    Solve exact cover using Algorithm X with incrementally maintained indexes:
+    - constraint index: open constraint -> set of live candidates (MRV, early
+      infeasibility when one runs empty)
+    - cell index: cell -> all candidates covering it (static)
+    Choosing a candidate removes its conflicts from the live sets and records
+    them; backtracking restores exactly those, so a search node costs time
+    proportional to its conflicts, not to the whole candidate list.
+    Placements may be sets of cells or bitboards. Keeps the depth limit (80)
+    and timeout (2s) for fast rejection.
     """
-    import time
-    
-    # Track start time on first call
-    if start_time is None:
-        start_time = time.time()
-    
-    # Check timeout FIRST - most important for speed
-    if time.time() - start_time > timeout_secs:
-        return None
-    
-    # Very aggressive depth limit 
-    if depth > max_depth:
-        return None
-    if solution is None:
-        solution = []
+    start_time = time.time()
     if tracker is None:
         tracker = {"nodes": 0, "solutions": 0, "total_instances": len(shape_constraints)}
-    
-    # Build indices on first call
-    if constraint_index is None:
-        constraint_index = {}
-        for i, (shape_id, instance_id, placement) in enumerate(candidates):
-            key = (shape_id, instance_id)
-            if key not in constraint_index:
-                constraint_index[key] = []
-            constraint_index[key].append(i)
-    
-    if cell_index is None:
-        cell_index = {}
-        for i, (_, _, placement) in enumerate(candidates):
-            for cell in placement:
-                if cell not in cell_index:
-                    cell_index[cell] = []
-                cell_index[cell].append(i)
-    
-    # Base case: all shape instances placed
-    if not shape_constraints:
-        tracker["solutions"] += 1
-        return solution
-    
-    # **OPTIMIZATION 1: Early feasibility check**
-    # If any constraint has zero candidates, backtrack immediately
-    for constraint in shape_constraints:
-        if len(constraint_index.get(constraint, [])) == 0:
-            return None
-    
-    # MRV heuristic: choose constraint with fewest candidates
-    constraint = min(
-        shape_constraints,
-        key=lambda c: len(constraint_index.get(c, []))
-    )
-    
-    valid_candidate_indices = constraint_index.get(constraint, [])
-    
-    # Try each candidate (placement) for this instance
-    for cand_idx in valid_candidate_indices:
-        candidate = candidates[cand_idx]
-        shape_id, instance_id, placement = candidate
-        tracker["nodes"] += 1
-        
-        # Single-line progress update
-        if progress_cb and tracker["nodes"] % 1000 == 0:
-            placed = len(solution)
-            total = tracker.get("total_instances", placed)
-            pct = int(100 * placed / total) if total else 100
-            progress_cb(pct, placed, total, tracker["nodes"], tracker["solutions"])
-        
-        # Choose this candidate
-        new_solution = solution + [candidate]
-        new_shape_constraints = shape_constraints - {(shape_id, instance_id)}
-        
-        # **OPTIMIZATION 2: Efficient filtering**
-        # Find conflicting indices via cell index
-        conflicting_indices = set([cand_idx])
-        for cell in placement:
-            conflicting_indices.update(cell_index.get(cell, []))
-        
-        # **OPTIMIZATION 3: Incremental index updates (only create new maps)**
-        new_constraint_index = {}
-        new_cell_index = {}
-        
-        # Only iterate through non-conflicting candidates
-        for i in range(len(candidates)):
-            if i in conflicting_indices:
-                continue
-                
-            cand = candidates[i]
-            cand_shape_id, cand_instance_id, cand_placement = cand
-            
-            # Skip if constraint is already satisfied
-            if (cand_shape_id, cand_instance_id) not in new_shape_constraints:
-                continue
-            
-            # Add to constraint index
-            key = (cand_shape_id, cand_instance_id)
-            if key not in new_constraint_index:
-                new_constraint_index[key] = []
-            new_constraint_index[key].append(i)
-            
-            # Add to cell index
-            for cell in cand_placement:
-                if cell not in new_cell_index:
-                    new_cell_index[cell] = []
-                new_cell_index[cell].append(i)
-        
-        # Recurse (pass candidates through, along with updated indices)
-        result = algorithm_x(candidates, new_shape_constraints, new_solution, depth + 1, tracker, progress_cb,
-                           new_constraint_index, new_cell_index, max_depth, timeout_secs, start_time)
-        
-        if result is not None:
-            return result
-    
+    # Telemetry: deepest partial solution, constraints covered / restored
+    for key in ("best_depth", "covers", "uncovers"):
+        tracker.setdefault(key, 0)
+
+    keys = [(shape_id, instance_id) for shape_id, instance_id, _ in candidates]
+    constraint_index = {constraint: set() for constraint in shape_constraints}
+    # Bitboard placements are indexed by bit number, set placements by (row, col)
+    cells_of = [mask_bits(p) if isinstance(p, int) else p for _, _, p in candidates]
+    cell_index = {}
+    for i, cells in enumerate(cells_of):
+        if keys[i] in constraint_index:
+            constraint_index[keys[i]].add(i)
+        for cell in cells:
+            cell_index.setdefault(cell, []).append(i)
+    alive = [keys[i] in constraint_index for i in range(len(candidates))]
+    open_constraints = set(shape_constraints)
+    solution = []
+
+    def remove(i, removed):
+        alive[i] = False
+        constraint_index[keys[i]].discard(i)
+        removed.append(i)
+
+    def search(depth):
+        if time.time() - start_time > timeout_secs or depth > max_depth:
+            return False
+        if not open_constraints:
+            tracker["solutions"] += 1
+            return True
+
+        # MRV, with early exit when some constraint has no candidate left
+        constraint = min(open_constraints, key=lambda c: len(constraint_index[c]))
+        if not constraint_index[constraint]:
+            return False
+
+        for cand_idx in sorted(constraint_index[constraint]):
+            tracker["nodes"] += 1
+            if progress_cb and tracker["nodes"] % 1000 == 0:
+                placed = len(solution)
+                total = tracker.get("total_instances", placed)
+                pct = int(100 * placed / total) if total else 100
+                progress_cb(pct, placed, total, tracker["nodes"], tracker["solutions"])
+
+            # Descend: drop the other candidates of this constraint and every
+            # live candidate sharing a cell with the chosen placement
+            removed = []
+            for i in list(constraint_index[constraint]):
+                remove(i, removed)
+            for cell in cells_of[cand_idx]:
+                for i in cell_index[cell]:
+                    if alive[i]:
+                        remove(i, removed)
+            open_constraints.discard(constraint)
+            solution.append(candidates[cand_idx])
+            tracker["covers"] += 1
+            if depth + 1 > tracker["best_depth"]:
+                tracker["best_depth"] = depth + 1
+
+            if search(depth + 1):
+                return True
+
+            # Backtrack: restore exactly what this step removed
+            tracker["uncovers"] += 1
+            solution.pop()
+            open_constraints.add(constraint)
+            for i in removed:
+                alive[i] = True
+                constraint_index[keys[i]].add(i)
+
+        return False
+
+    if search(0):
+        return list(solution)
     return None
 
 
 def visualize_solution(width, height, solution):
-    """Create a visual representation of the solution."""
+    """Create a visual representation of the solution (set or bitboard placements)."""
     grid = [['.' for _ in range(width)] for _ in range(height)]
     
     for shape_id, instance_id, placement in solution:
+        if isinstance(placement, int):
+            placement = mask_to_coords(placement, width)
         for r, c in placement:
             grid[r][c] = str(shape_id)
     
@@ -301,9 +484,321 @@ def visualize_solution(width, height, solution):
     print("    +" + "-" * width + "+")
 
 
+def solution_record(shapes, region_idx, width, height, counts, solution):
+    """One solution_file record: (shape id, orientation id, row, col) per placed copy."""
+    table = get_placement_table(shapes)
+    placements = []
+    for sid, _, placement in solution:
+        if not isinstance(placement, int):
+            placement = coords_to_mask(placement, width)
+        placements.append((sid, *table.locate(sid, width, height, placement)))
+    return {"region": region_idx, "width": width, "height": height, "counts": list(counts),
+            "placements": placements}
+
+
 # --- DLX (Dancing Links) exact cover solver ---
+SOLVED = "SOLVED"
+IMPOSSIBLE = "IMPOSSIBLE"
+BUDGET_EXHAUSTED = "BUDGET_EXHAUSTED"
+
+
+@dataclass
+class SearchResult:
+    status: str  # SOLVED, IMPOSSIBLE or BUDGET_EXHAUSTED
+    solutions: list = field(default_factory=list)
+    nodes: int = 0  # rows tried
+    elapsed: float = 0.0
+    pruned: int = 0  # rows rejected by space pruning
+    best_depth: int = 0  # most rows selected at once
+    covers: int = 0  # column cover / uncover operations
+    uncovers: int = 0
+    tt_hits: int = 0  # branches cut by the transposition table
+
+
+class TranspositionTable:
+    """
+    Bounded table of search states proven dead (no completion exists), with
+    least-recently-used eviction. A state is a hashable key (occupied
+    bitboard, remaining copies per shape) plus an optional tuple of rank
+    floors: a state whose floors are all >= those of a dead entry has fewer
+    options left, so it is dead too.
+    """
+    def __init__(self, max_entries=200_000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> list of floor tuples proven dead
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def dead(self, key, floors=()):
+        stored = self.entries.get(key)
+        if stored is None:
+            return False
+        for dead_floors in stored:
+            if all(a <= b for a, b in zip(dead_floors, floors)):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True
+        return False
+
+    def add(self, key, floors=()):
+        stored = self.entries.get(key)
+        if stored is None:
+            self.entries[key] = [floors]
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            return
+        # Keep only the weakest (lowest) floor tuples
+        stored[:] = [f for f in stored if not all(a >= b for a, b in zip(f, floors))]
+        stored.append(floors)
+        self.entries.move_to_end(key)
+
+
+class IterativeSearchMixin:
+    """
+    Non-recursive DLX search driven by an explicit stack of (column, row)
+    frames, with an optional node budget and wall-clock limit. The concrete
+    class provides cover/uncover plus the small traversal hooks used here
+    (_next_free_row: next row below r in col that does not overlap the
+    occupied cells and is above the rank floor; _mask, _rank, ...).
+
+    Symmetry breaking (break_symmetry): for columns that are interchangeable
+    copies, copy i may only be branched on after copy i-1 is placed, and only
+    with rows of a higher rank, so the count! orderings collapse into one.
+
+    Space pruning (enable_space_pruning): with bitboard rows the search keeps
+    the free-cell count, the remaining demand and the cells of pockets too
+    small for any remaining shape, and backtracks as soon as the usable free
+    area drops below the demand.
+
+    Transposition table (enable_transposition): with bitboard rows, states
+    whose subtree was exhausted are remembered by occupied cells and copies
+    left per shape (plus the rank floor of the next copy with symmetry
+    breaking), so reaching the same state by another placement order is cut.
+    """
+    sym_next = {}
+    sym_floor = {}
+    sym_blocked = frozenset()
+    prune = False
+    covers = 0  # counted by cover() / uncover()
+    uncovers = 0
+    tt = None
+
+    def enable_space_pruning(self, width, height, sizes):
+        """sizes: cell count of every piece still to place (one entry per primary row group)."""
+        self.prune = True
+        self.board_width = width
+        self.board_area = width * height
+        self.full = (1 << self.board_area) - 1
+        col0 = 0
+        for r in range(height):
+            col0 |= 1 << (r * width)
+        self.not_col0 = self.full & ~col0
+        self.not_last_col = self.full & ~(col0 << (width - 1))
+        self.demand = sum(sizes)
+        self.size_counts = {}
+        for size in sizes:
+            self.size_counts[size] = self.size_counts.get(size, 0) + 1
+        self.dead = 0  # free cells in pockets no remaining piece fits
+        self.prune_stack = []
+
+    def _dilate(self, x):
+        w = self.board_width
+        return (x | ((x << 1) & self.not_col0) | ((x >> 1) & self.not_last_col) | (x << w) | (x >> w)) & self.full
+
+    def _space_dead_end(self, mask):
+        """Update pocket bookkeeping after placing mask; True if the branch cannot be completed."""
+        slack = self.board_area - self.occupied.bit_count() - self.dead.bit_count() - self.demand
+        if slack < 0:
+            return True
+        sizes = [size for size, count in self.size_counts.items() if count]
+        if not sizes:
+            return False
+        min_size = min(sizes)
+        free = self.full & ~self.occupied & ~self.dead
+        # Only pockets touching the new piece can be new; grow each one until
+        # it is closed (a pocket) or large enough for the smallest piece
+        seeds = self._dilate(mask) & free
+        while seeds:
+            comp = seeds & -seeds
+            while True:
+                grown = self._dilate(comp) & free
+                if grown == comp or grown.bit_count() >= min_size:
+                    break
+                comp = grown
+            if grown == comp and comp.bit_count() < min_size:
+                self.dead |= comp
+                slack -= comp.bit_count()
+                if slack < 0:
+                    return True
+            else:
+                comp = grown
+            seeds &= ~comp
+        return False
+
+    def enable_transposition(self, groups, max_entries=200_000):
+        """
+        groups: one list of column names per shape, its interchangeable copies
+        in order (every primary column that is branched on). Needs bitboard
+        rows: the occupied cells are part of the state.
+        """
+        self.tt = TranspositionTable(max_entries)
+        self.tt_groups = [[self._column(name) for name in names] for names in groups]
+        self.tt_group_of = {col: g for g, cols in enumerate(self.tt_groups) for col in cols}
+        self.tt_remaining = [len(cols) for cols in self.tt_groups]
+
+    def _tt_key(self):
+        """(key, floors) of the current state for the transposition table."""
+        remaining = tuple(self.tt_remaining)
+        if not self.sym_next:
+            return (self.occupied, remaining), ()
+        # Copies are placed in order: the next one of each group starts above its rank floor
+        floors = tuple(self.sym_floor.get(cols[len(cols) - left], -1)
+                       for cols, left in zip(self.tt_groups, remaining) if left)
+        return (self.occupied, remaining), floors
+
+    def break_symmetry(self, copy_groups):
+        """
+        copy_groups: lists of column names, each list a group of identical
+        copies in order. Rows of these columns must have been added with
+        increasing rank. Only valid while those columns are the only primary
+        columns that are branched on (i.e. not with require_full_cover).
+        """
+        self.sym_next = {}
+        self.sym_floor = {}
+        self.sym_blocked = set()
+        for names in copy_groups:
+            cols = [self._column(name) for name in names]
+            for prev, nxt in zip(cols, cols[1:]):
+                self.sym_next[prev] = nxt
+                self.sym_blocked.add(nxt)
+            for col in cols:
+                self.sym_floor[col] = -1
+
+    def _select(self, r, col=None):
+        self.occupied |= self._mask(r)
+        self.solution.append(r)
+        if self.prune:
+            size = self._mask(r).bit_count()
+            self.prune_stack.append((self.dead, size))
+            self.demand -= size
+            self.size_counts[size] -= 1
+        for c in self._row_columns(r):
+            self.cover(c)
+        nxt = self.sym_next.get(col)
+        if nxt is not None:
+            self.sym_blocked.discard(nxt)
+            self.sym_floor[nxt] = self._rank(r)
+        if self.tt is not None:
+            self.tt_remaining[self.tt_group_of[col]] -= 1
+
+    def _deselect(self, r, col=None):
+        if self.tt is not None:
+            self.tt_remaining[self.tt_group_of[col]] += 1
+        nxt = self.sym_next.get(col)
+        if nxt is not None:
+            self.sym_blocked.add(nxt)
+            self.sym_floor[nxt] = -1
+        for c in reversed(self._row_columns(r)):
+            self.uncover(c)
+        self.solution.pop()
+        self.occupied ^= self._mask(r)
+        if self.prune:
+            self.dead, size = self.prune_stack.pop()
+            self.demand += size
+            self.size_counts[size] += 1
+
+    def search_iterative(self, max_solutions=1, node_budget=None, timeout_secs=None, progress_cb=None,
+                         progress_every=4096):
+        # progress_cb: called every progress_every nodes with a stats dict
+        # (nodes, nodes_per_sec, depth, best_depth, covers, uncovers, pruned, elapsed)
+        start = time.time()
+        deadline = start + timeout_secs if timeout_secs is not None else None
+        solutions = []
+        nodes = 0
+        pruned = 0
+        best_depth = 0
+        status = None
+        self.covers = self.uncovers = 0
+
+        tt = self.tt
+        tt_hits = tt.hits if tt is not None else 0
+        col = self._choose_column()
+        if col is None:
+            return SearchResult(SOLVED, [[]], 0, time.time() - start)
+        self.cover(col)
+        # frame: [column, selected row (== column: none yet), state key for the transposition table]
+        stack = [[col, col, self._tt_key() if tt is not None else None]]
+
+        while stack:
+            frame = stack[-1]
+            col, r, key = frame
+            if r != col:
+                self._deselect(r, col)
+            r = self._next_free_row(col, r)
+            if r == col:
+                # Column exhausted: backtrack; the state is dead unless a solution was found below it
+                self.uncover(col)
+                stack.pop()
+                if tt is not None and not solutions:
+                    tt.add(*key)
+                continue
+            frame[1] = r
+
+            nodes += 1
+            if node_budget is not None and nodes > node_budget:
+                status = BUDGET_EXHAUSTED
+            elif deadline is not None and nodes % 256 == 0 and time.time() > deadline:
+                status = BUDGET_EXHAUSTED
+            if status:
+                frame[1] = col
+                break
+            if progress_cb is not None and nodes % progress_every == 0:
+                elapsed = time.time() - start
+                progress_cb({"nodes": nodes, "nodes_per_sec": nodes / elapsed if elapsed else 0.0,
+                             "depth": len(stack), "best_depth": best_depth, "covers": self.covers,
+                             "uncovers": self.uncovers, "pruned": pruned, "elapsed": elapsed})
+
+            self._select(r, col)
+            if len(stack) > best_depth:
+                best_depth = len(stack)
+            if self.prune and self._space_dead_end(self._mask(r)):
+                pruned += 1
+                continue
+            nxt = self._choose_column()
+            if nxt is None:
+                solutions.append(list(self.solution))
+                if len(solutions) >= max_solutions:
+                    status = SOLVED
+                    break
+                continue
+            key = None
+            if tt is not None:
+                key = self._tt_key()
+                if tt.dead(*key):
+                    continue
+            self.cover(nxt)
+            stack.append([nxt, nxt, key])
+
+        # Unwind whatever is still covered so the matrix can be searched again
+        while stack:
+            col, r, _ = stack.pop()
+            if r != col:
+                self._deselect(r, col)
+            self.uncover(col)
+
+        if status is None:
+            status = SOLVED if solutions else IMPOSSIBLE
+        tt_hits = tt.hits - tt_hits if tt is not None else 0
+        return SearchResult(status, solutions, nodes, time.time() - start, pruned, best_depth, self.covers,
+                            self.uncovers, tt_hits)
+
+
 class DLXNode:
-    __slots__ = ("L", "R", "U", "D", "C", "row")
+    __slots__ = ("L", "R", "U", "D", "C", "row", "mask", "rank")
     def __init__(self):
         self.L = self
         self.R = self
@@ -311,6 +806,8 @@ class DLXNode:
         self.D = self
         self.C = None  # column header
         self.row = None  # optional row identifier
+        self.mask = 0  # optional bitboard of the cells this row occupies
+        self.rank = 0  # optional order key of the row (symmetry breaking)
 
 class DLXColumn(DLXNode):
     __slots__ = ("name", "size")
@@ -319,8 +816,11 @@ class DLXColumn(DLXNode):
         self.name = name
         self.size = 0  # number of nodes in this column
 
-class DLX:
-    def __init__(self, column_names):
+class DLX(IterativeSearchMixin):
+    def __init__(self, column_names, secondary=()):
+        # column_names: primary columns, covered exactly once
+        # secondary: optional columns (Knuth), covered at most once; they stay
+        # out of the header list, so they are never chosen and need not be covered
         # Create header and column list in a circular doubly linked list
         self.header = DLXNode()
         self.columns = {}
@@ -334,9 +834,17 @@ class DLX:
             last.R.L = col
             last.R = col
             last = col
+        for name in secondary:
+            col = DLXColumn(name)
+            col.L = col.R = col  # covering unlinks it from itself: a no-op
+            self.columns[name] = col
         self.solution = []
+        self.occupied = 0  # union of the masks of the selected rows
 
-    def add_row(self, row_id, col_names):
+    def add_row(self, row_id, col_names, mask=0, rank=0):
+        # mask: optional bitboard; rows whose mask overlaps an already selected
+        # row are skipped during search
+        # rank: order key used by break_symmetry (increasing within a column)
         first = None
         # Create nodes for this row under each column
         for cname in col_names:
@@ -344,6 +852,8 @@ class DLX:
             node = DLXNode()
             node.C = col
             node.row = row_id
+            node.mask = mask
+            node.rank = rank
             # insert into column at bottom
             node.D = col
             node.U = col.U
@@ -361,7 +871,50 @@ class DLX:
                 first.L.R = node
                 first.L = node
 
+    def row_of(self, node):
+        """Row identifier of a node returned by search()."""
+        return node.row
+
+    # Traversal hooks for IterativeSearchMixin
+    def _column(self, name):
+        return self.columns[name]
+
+    def _choose_column(self):
+        if self.header.R is self.header:
+            return None
+        blocked = self.sym_blocked
+        min_col = None
+        c = self.header.R
+        while c is not self.header:
+            if (min_col is None or c.size < min_col.size) and c not in blocked:
+                min_col = c
+            c = c.R
+        return min_col
+
+    def _mask(self, node):
+        return node.mask
+
+    def _rank(self, node):
+        return node.rank
+
+    def _next_free_row(self, col, r):
+        occupied = self.occupied
+        floor = self.sym_floor.get(col, -1)
+        r = r.D
+        while r is not col and (r.mask & occupied or r.rank <= floor):
+            r = r.D
+        return r
+
+    def _row_columns(self, r):
+        cols = []
+        j = r.R
+        while j is not r:
+            cols.append(j.C)
+            j = j.R
+        return cols
+
     def cover(self, col):
+        self.covers += 1
         col.R.L = col.L
         col.L.R = col.R
         i = col.D
@@ -375,6 +928,7 @@ class DLX:
             i = i.D
 
     def uncover(self, col):
+        self.uncovers += 1
         i = col.U
         while i is not col:
             j = i.L
@@ -402,6 +956,10 @@ class DLX:
         r = min_col.D
         solutions = []
         while r is not min_col:
+            if r.mask & self.occupied:
+                r = r.D
+                continue
+            self.occupied |= r.mask
             self.solution.append(r)
             j = r.R
             while j is not r:
@@ -417,90 +975,888 @@ class DLX:
                         self.uncover(j.C)
                         j = j.L
                     self.solution.pop()
+                    self.occupied ^= r.mask
                     break
             j = r.L
             while j is not r:
                 self.uncover(j.C)
                 j = j.L
             self.solution.pop()
+            self.occupied ^= r.mask
             r = r.D
         self.uncover(min_col)
         return solutions
 
 
-def solve_with_dlx(shapes, width, height, counts, require_full_cover=False):
+class ArrayDLX(IterativeSearchMixin):
+    """
+    DLX with the links stored in flat array('i') tables indexed by node number.
+    Node 0 is the root, nodes 1..n are the column headers (primary, then
+    secondary), matrix entries follow. Same add_row/search API as DLX;
+    search() returns node numbers.
+    """
+    def __init__(self, column_names, secondary=()):
+        names = list(column_names) + list(secondary)
+        n = len(names)
+        p = len(column_names)
+        self.col_index = {name: i + 1 for i, name in enumerate(names)}
+        self.names = [None] + names
+        # Root plus primary headers linked left/right in a ring; secondary headers link to themselves
+        self.L = array('i', [p] + list(range(p)) + list(range(p + 1, n + 1)))
+        self.R = array('i', list(range(1, p + 1)) + [0] + list(range(p + 1, n + 1)))
+        self.U = array('i', range(n + 1))
+        self.D = array('i', range(n + 1))
+        self.C = array('i', range(n + 1))
+        self.S = array('i', [0] * (n + 1))  # column sizes
+        self.node_row = array('i', [-1] * (n + 1))
+        self.node_mask = [0] * (n + 1)  # row bitboard per node (shared int objects)
+        self.node_rank = array('i', [0] * (n + 1))
+        self.row_ids = []
+        self.solution = []
+        self.occupied = 0
+
+    def add_row(self, row_id, col_names, mask=0, rank=0):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        node_row, node_mask, node_rank = self.node_row, self.node_mask, self.node_rank
+        row = len(self.row_ids)
+        self.row_ids.append(row_id)
+        first = node = len(L)
+        for cname in col_names:
+            col = self.col_index[cname]
+            # insert into column at bottom
+            U.append(U[col])
+            D.append(col)
+            D[U[col]] = node
+            U[col] = node
+            C.append(col)
+            S[col] += 1
+            node_row.append(row)
+            node_mask.append(mask)
+            node_rank.append(rank)
+            # link horizontally (ring closed below)
+            L.append(node - 1)
+            R.append(node + 1)
+            node += 1
+        if node > first:
+            L[first] = node - 1
+            R[node - 1] = first
+
+    def row_of(self, node):
+        """Row identifier of a node returned by search()."""
+        return self.row_ids[self.node_row[node]]
+
+    # Traversal hooks for IterativeSearchMixin
+    def _column(self, name):
+        return self.col_index[name]
+
+    def _choose_column(self):
+        R, S = self.R, self.S
+        if R[0] == 0:
+            return None
+        blocked = self.sym_blocked
+        min_col = None
+        c = R[0]
+        while c != 0:
+            if (min_col is None or S[c] < S[min_col]) and c not in blocked:
+                min_col = c
+            c = R[c]
+        return min_col
+
+    def _mask(self, node):
+        return self.node_mask[node]
+
+    def _rank(self, node):
+        return self.node_rank[node]
+
+    def _next_free_row(self, col, r):
+        D, node_mask, node_rank, occupied = self.D, self.node_mask, self.node_rank, self.occupied
+        floor = self.sym_floor.get(col, -1)
+        r = D[r]
+        while r != col and (node_mask[r] & occupied or node_rank[r] <= floor):
+            r = D[r]
+        return r
+
+    def _row_columns(self, r):
+        R, C = self.R, self.C
+        cols = []
+        j = R[r]
+        while j != r:
+            cols.append(C[j])
+            j = R[j]
+        return cols
+
+    def cover(self, col):
+        self.covers += 1
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[col]] = R[col]
+        L[R[col]] = L[col]
+        i = D[col]
+        while i != col:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, col):
+        self.uncovers += 1
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[col]
+        while i != col:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[col]] = col
+        L[R[col]] = col
+
+    def search(self, k=0, max_solutions=1):
+        R, D, L, C, S = self.R, self.D, self.L, self.C, self.S
+        if R[0] == 0:
+            return [list(self.solution)]
+        # Choose column with minimum size (MRV)
+        c = R[0]
+        min_col = c
+        while c != 0:
+            if S[c] < S[min_col]:
+                min_col = c
+            c = R[c]
+        self.cover(min_col)
+        node_mask = self.node_mask
+        occupied = self.occupied
+        solutions = []
+        r = D[min_col]
+        while r != min_col:
+            mask = node_mask[r]
+            if mask & occupied:
+                r = D[r]
+                continue
+            self.occupied = occupied | mask
+            self.solution.append(r)
+            j = R[r]
+            while j != r:
+                self.cover(C[j])
+                j = R[j]
+            sols = self.search(k + 1, max_solutions)
+            j = L[r]
+            while j != r:
+                self.uncover(C[j])
+                j = L[j]
+            self.solution.pop()
+            self.occupied = occupied
+            if sols:
+                solutions.extend(sols)
+                if len(solutions) >= max_solutions:
+                    break
+            r = D[r]
+        self.uncover(min_col)
+        return solutions
+
+
+def build_dlx(shapes, width, height, counts, require_full_cover=False, bitboard=False, dlx_class=None,
+              symmetry=False, prune=True, transposition=None, secondary_cells=None):
+    """
+    Build the exact cover matrix for one region (see solve_with_dlx).
+    symmetry: treat the copies of a shape as a multiset (ordered copies with
+    increasing placement rank); ignored with require_full_cover, where cell
+    columns are branched on too.
+    prune: with bitboard, cut branches whose usable free area (free cells
+    minus pockets too small for any remaining shape) is below the demand.
+    transposition: with bitboard and without require_full_cover, remember up
+    to this many dead states (occupied cells + copies left) in an LRU table.
+    secondary_cells: without require_full_cover, add every cell as a
+    secondary column (covered at most once), so non-overlap is part of the
+    matrix and conflicting rows leave the column counts. Default: only for
+    set placements, bitboards already reject overlap with `&`. Set placements
+    have no other overlap check, so turning it off for them is a ValueError.
+    """
+    if secondary_cells is None:
+        secondary_cells = not bitboard
+    if not (bitboard or require_full_cover or secondary_cells):
+        raise ValueError("set placements need secondary cell columns (or require_full_cover) to rule out overlap")
+    cells_as_columns = require_full_cover or secondary_cells
     # Columns: all shape instances (must be used exactly once)
-    # Optionally also include every cell (require_full_cover) to force tiling.
+    # Cells are primary with require_full_cover (force tiling), otherwise optionally secondary (packing).
     instance_cols = [(sid, iid) for sid, cnt in enumerate(counts) for iid in range(cnt)]
-    cell_cols = [(r, c) for r in range(height) for c in range(width)] if require_full_cover else []
+    cell_cols = [(r, c) for r in range(height) for c in range(width)] if cells_as_columns else []
     # Column names must be unique and hashable; use tuples
-    column_names = [("S", sid, iid) for (sid, iid) in instance_cols] + [("C", r, c) for (r, c) in cell_cols]
-    dlx = DLX(column_names)
-    # Precompute orientations and placements
-    orient_cache = {}
-    for sid, shape_matrix in shapes.items():
-        orient_cache[sid] = get_all_orientations(shape_matrix)
+    column_names = [("S", sid, iid) for (sid, iid) in instance_cols]
+    cell_names = [("C", r, c) for (r, c) in cell_cols]
+    if require_full_cover:
+        dlx = (dlx_class or DLX)(column_names + cell_names)
+    else:
+        dlx = (dlx_class or DLX)(column_names, secondary=cell_names)
+    # Placements come from the shared table; instances (and regions) share them
+    table = get_placement_table(shapes)
+    placement_cache = {}
+    for sid, cnt in enumerate(counts):
+        if cnt:
+            if bitboard:
+                placement_cache[sid] = table.masks(sid, width, height)
+            else:
+                placement_cache[sid] = table.coord_placements(sid, width, height)
     # Add rows: each feasible placement of a specific instance covers its instance column and all cells it occupies
     for sid, cnt in enumerate(counts):
         for iid in range(cnt):
-            for orient in orient_cache[sid]:
-                for placement in generate_placements(orient, width, height):
-                    cols = [("S", sid, iid)]
-                    if require_full_cover:
+            for rank, placement in enumerate(placement_cache[sid]):
+                cols = [("S", sid, iid)]
+                if bitboard:
+                    if cells_as_columns:
+                        cols += [("C", r, c) for (r, c) in mask_to_coords(placement, width)]
+                    dlx.add_row((sid, iid, placement), cols, mask=placement, rank=rank)
+                else:
+                    if cells_as_columns:
                         cols += [("C", r, c) for (r, c) in placement]
-                    dlx.add_row((sid, iid, placement), cols)
+                    dlx.add_row((sid, iid, placement), cols, rank=rank)
+    if symmetry and not require_full_cover:
+        dlx.break_symmetry([[("S", sid, iid) for iid in range(cnt)] for sid, cnt in enumerate(counts) if cnt > 1])
+    if bitboard and prune:
+        dlx.enable_space_pruning(width, height, [table.cells[sid] for sid, cnt in enumerate(counts) for _ in range(cnt)])
+    if bitboard and transposition and not require_full_cover:
+        dlx.enable_transposition([[("S", sid, iid) for iid in range(cnt)] for sid, cnt in enumerate(counts) if cnt],
+                                 transposition)
+    return dlx
+
+
+def solve_with_dlx(shapes, width, height, counts, require_full_cover=False, bitboard=False, dlx_class=None,
+                   node_budget=None, timeout_secs=None, tracker=None, symmetry=False, prune=True, progress_cb=None,
+                   transposition=None, secondary_cells=None):
+    # bitboard: placements are int masks and overlapping rows are rejected with a single `&`
+    # dlx_class: DLX (default, one object per node) or ArrayDLX (flat link tables)
+    # node_budget / timeout_secs: give up after that many rows tried / seconds of search
+    # tracker: optional dict, receives "status" (SOLVED / IMPOSSIBLE / BUDGET_EXHAUSTED), "nodes" and the
+    #   telemetry of search_iterative plus "build_secs" (placements + matrix) and "search_secs"
+    # symmetry: explore copies of the same shape as a multiset instead of count! orderings
+    # prune: (bitboard) backtrack when free area minus dead pockets is below the remaining demand
+    # progress_cb: live stats dict every few thousand nodes (see search_iterative)
+    # transposition: (bitboard) size of the LRU table of dead states, None disables it
+    # secondary_cells: cells as secondary (at most once) columns; default on for set placements
+    start = time.time()
+    dlx = build_dlx(shapes, width, height, counts, require_full_cover, bitboard, dlx_class, symmetry, prune,
+                    transposition, secondary_cells)
+    build_secs = time.time() - start
     # Run DLX search for one solution
-    sols = dlx.search(max_solutions=1)
+    result = dlx.search_iterative(max_solutions=1, node_budget=node_budget, timeout_secs=timeout_secs,
+                                  progress_cb=progress_cb)
+    if tracker is not None:
+        tracker["status"] = result.status
+        tracker["nodes"] = result.nodes
+        tracker["pruned"] = result.pruned
+        tracker["best_depth"] = result.best_depth
+        tracker["covers"] = result.covers
+        tracker["uncovers"] = result.uncovers
+        tracker["build_secs"] = build_secs
+        tracker["search_secs"] = result.elapsed
+        tracker["nodes_per_sec"] = result.nodes / result.elapsed if result.elapsed else 0.0
+        if dlx.tt is not None:
+            tracker["tt_hits"] = result.tt_hits
+            tracker["tt_size"] = len(dlx.tt)
+    sols = result.solutions
     if not sols:
         return None
     # Convert nodes back to solution triples
     nodes = sols[0]
     solution = []
     for node in nodes:
-        rid = node.row
+        rid = dlx.row_of(node)
         solution.append(rid)
     return solution
 
 
-def classify_region(shapes, width, height, counts):
+def solve_with_algorithm_x(shapes, width, height, counts, bitboard=False, timeout_secs=None, tracker=None,
+                           progress_cb=None, **_options):
+    # Recursive Algorithm X behind the solve_region interface; DLX-only options are ignored
+    # progress_cb / tracker telemetry: same keys as solve_with_dlx (covers = constraints chosen)
+    start = time.time()
+    candidates, constraints = build_exact_cover_problem(shapes, width, height, counts, bitboard)
+    inner = {"nodes": 0, "solutions": 0, "total_instances": len(constraints)}
+    search_start = time.time()
+    limit = timeout_secs if timeout_secs is not None else float("inf")
+
+    def progress(pct, placed, total, nodes, solutions):
+        elapsed = time.time() - search_start
+        progress_cb({"nodes": nodes, "nodes_per_sec": nodes / elapsed if elapsed else 0.0,
+                     "depth": placed, "best_depth": inner["best_depth"], "covers": inner["covers"],
+                     "uncovers": inner["uncovers"], "pruned": 0, "elapsed": elapsed})
+
+    solution = algorithm_x(candidates, constraints, tracker=inner, progress_cb=progress if progress_cb else None,
+                           max_depth=len(constraints), timeout_secs=limit)
+    search_secs = time.time() - search_start
+    if tracker is not None:
+        if solution is not None:
+            tracker["status"] = SOLVED
+        else:
+            tracker["status"] = BUDGET_EXHAUSTED if search_secs > limit else IMPOSSIBLE
+        for key in ("nodes", "best_depth", "covers", "uncovers"):
+            tracker[key] = inner[key]
+        tracker["build_secs"] = search_start - start
+        tracker["search_secs"] = search_secs
+        tracker["nodes_per_sec"] = inner["nodes"] / search_secs if search_secs else 0.0
+    return solution
+
+
+def solve_with_sat(shapes, width, height, counts, node_budget=None, timeout_secs=None, tracker=None,
+                   sat_solver="auto", **_options):
+    # CNF encoding (sat_backend) solved by PySAT, OR-Tools CP-SAT or the built-in CDCL
+    # sat_solver: "auto" (first installed), "pysat", "cpsat" or "builtin"
+    # node_budget: conflict budget (PySAT and built-in solver only); DLX-only options are ignored
+    table = get_placement_table(shapes)
+    placements = {sid: table.masks(sid, width, height) for sid, cnt in enumerate(counts) if cnt}
+    info = {}
+    status, chosen = solve_packing(placements, counts, width * height, solver=sat_solver,
+                                   timeout_secs=timeout_secs, conflict_budget=node_budget, info=info)
+    if tracker is not None:
+        tracker["status"] = status
+        tracker["nodes"] = info.get("conflicts", 0)
+        tracker["sat_solver"] = info["solver"]
+    if chosen is None:
+        return None
+    # The encoding asks for at least `count` copies; keep exactly `count` and number them
+    solution = []
+    used = [0] * len(counts)
+    for sid, mask in chosen:
+        if used[sid] < counts[sid]:
+            solution.append((sid, used[sid], mask))
+            used[sid] += 1
+    return solution
+
+
+def frontier_search(shapes, width, height, counts, node_budget=None, timeout_secs=None, transposition=200_000,
+                    progress_cb=None, progress_every=4096):
+    """
+    Exact search branching on cells instead of shape copies: take the first
+    empty cell in scan order and either place a copy whose first cell it is
+    or leave it empty. At most area - demand cells may be left empty. Since
+    every earlier cell is decided, the candidates are exactly the placements
+    anchored at that cell, which keeps the branching small on dense boards.
+    The board is scanned along its shorter side (transposed if needed).
+    The state is (decided cells, copies left per shape), so dead states go
+    into a TranspositionTable of `transposition` entries (None/0: off).
+    Returns a SearchResult whose solution lists (shape_id, instance_id, mask).
+    """
+    start = time.time()
+    deadline = start + timeout_secs if timeout_secs is not None else None
+    transpose = width > height
+    w, h = (height, width) if transpose else (width, height)
+    table = get_placement_table(shapes)
+    area = w * h
+    full = (1 << area) - 1
+    remaining = list(counts)
+    demand = sum(table.cells[sid] * cnt for sid, cnt in enumerate(counts))
+    if demand > area:
+        return SearchResult(IMPOSSIBLE, [], 0, time.time() - start)
+    # Placements by their first cell in scan order (lowest bit), larger shapes first
+    order = sorted((sid for sid, cnt in enumerate(counts) if cnt), key=lambda sid: -table.cells[sid])
+    anchored = {}
+    for sid in order:
+        per_cell = [[] for _ in range(area)]
+        for mask in table.masks(sid, w, h):
+            per_cell[(mask & -mask).bit_length() - 1].append(mask)
+        anchored[sid] = per_cell
+    tt = TranspositionTable(transposition) if transposition else None
+    state = {"skips": area - demand, "left": demand}
+
+    def options(filled):
+        free = full & ~filled
+        low = free & -free
+        cell = low.bit_length() - 1
+        opts = [(sid, mask) for sid in order if remaining[sid] for mask in anchored[sid][cell] if not mask & filled]
+        if state["skips"]:
+            opts.append((None, low))  # leave the cell empty
+        return opts
+
+    nodes = 0
+    covers = uncovers = 0
+    best_depth = 0
+    status = None
+    path = []
+    solution = None
+    # frame: [decided cells, options, next option index, applied option, state key]
+    stack = [[0, options(0), 0, None, (0, tuple(remaining))]] if demand else []
+    if not demand:
+        solution = []
+
+    while stack:
+        frame = stack[-1]
+        filled, opts, i, applied, key = frame
+        if applied is not None:
+            # Undo the option tried last in this frame
+            sid, mask = applied
+            if sid is None:
+                state["skips"] += 1
+            else:
+                remaining[sid] += 1
+                state["left"] += table.cells[sid]
+                uncovers += 1
+            path.pop()
+            frame[3] = None
+        if i == len(opts):
+            stack.pop()
+            if tt is not None:
+                tt.add(key)
+            continue
+        frame[2] = i + 1
+
+        nodes += 1
+        if node_budget is not None and nodes > node_budget:
+            status = BUDGET_EXHAUSTED
+        elif deadline is not None and nodes % 256 == 0 and time.time() > deadline:
+            status = BUDGET_EXHAUSTED
+        if status:
+            break
+        if progress_cb is not None and nodes % progress_every == 0:
+            elapsed = time.time() - start
+            progress_cb({"nodes": nodes, "nodes_per_sec": nodes / elapsed if elapsed else 0.0,
+                         "depth": len(path), "best_depth": best_depth, "covers": covers,
+                         "uncovers": uncovers, "pruned": 0, "elapsed": elapsed})
+
+        sid, mask = opts[i]
+        if sid is None:
+            state["skips"] -= 1
+        else:
+            remaining[sid] -= 1
+            state["left"] -= table.cells[sid]
+            covers += 1
+        path.append(opts[i])
+        frame[3] = opts[i]
+        if len(path) > best_depth:
+            best_depth = len(path)
+        if not state["left"]:
+            solution = [(sid, mask) for sid, mask in path if sid is not None]
+            break
+        child = filled | mask
+        child_key = (child, tuple(remaining))
+        if tt is not None and tt.dead(child_key):
+            continue
+        stack.append([child, options(child), 0, None, child_key])
+
+    if solution is None:
+        return SearchResult(status or IMPOSSIBLE, [], nodes, time.time() - start, 0, best_depth, covers, uncovers,
+                            tt.hits if tt is not None else 0)
+    result = []
+    used = [0] * len(counts)
+    for sid, mask in solution:
+        if transpose:
+            mask = coords_to_mask({(c, r) for r, c in mask_to_coords(mask, w)}, width)
+        result.append((sid, used[sid], mask))
+        used[sid] += 1
+    return SearchResult(SOLVED, [result], nodes, time.time() - start, 0, best_depth, covers, uncovers,
+                        tt.hits if tt is not None else 0)
+
+
+def solve_with_frontier(shapes, width, height, counts, node_budget=None, timeout_secs=None, tracker=None,
+                        progress_cb=None, transposition=200_000, **_options):
+    # First-empty-cell search (frontier_search) behind the solve_region interface; DLX-only options are ignored
+    result = frontier_search(shapes, width, height, counts, node_budget, timeout_secs, transposition, progress_cb)
+    if tracker is not None:
+        tracker["status"] = result.status
+        tracker["nodes"] = result.nodes
+        tracker["best_depth"] = result.best_depth
+        tracker["covers"] = result.covers
+        tracker["uncovers"] = result.uncovers
+        tracker["search_secs"] = result.elapsed
+        tracker["nodes_per_sec"] = result.nodes / result.elapsed if result.elapsed else 0.0
+        tracker["tt_hits"] = result.tt_hits
+    return result.solutions[0] if result.solutions else None
+
+
+# solve_region backends: name -> function(shapes, width, height, counts, tracker=None, **options)
+BACKENDS = {
+    "dlx": solve_with_dlx,
+    "algorithm_x": solve_with_algorithm_x,
+    "sat": solve_with_sat,
+    "frontier": solve_with_frontier,
+}
+
+
+def solve_region(shapes, width, height, counts, backend="dlx", tracker=None, **options):
+    """
+    Common entry point of the exact solvers: returns a list of
+    (shape_id, instance_id, placement) or None, and fills tracker with
+    "status" and "nodes" like solve_with_dlx. options go to the backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend](shapes, width, height, counts, tracker=tracker, **options)
+
+
+# --- Region pre-classifier ---
+# Each rule looks at one region and returns "EASY_YES", "EASY_NO" or None
+# (undecided); a rule that builds a packing returns ("EASY_YES", packing).
+# classify_region runs them in order, cheapest first.
+
+def shape_cell_count(shape_matrix):
+    return sum(row.count('#') for row in shape_matrix)
+
+
+def rule_cell_count(shapes, width, height, counts):
+    """EASY_NO: more # cells needed than the board has."""
+    needed = sum(shape_cell_count(shapes[sid]) * cnt for sid, cnt in enumerate(counts) if cnt)
+    if needed > width * height:
+        return "EASY_NO"
+    return None
+
+
+def rule_dimensions(shapes, width, height, counts):
+    """EASY_NO: a required shape is wider/taller than the board in every orientation."""
+    table = get_placement_table(shapes)
+    for sid, cnt in enumerate(counts):
+        if cnt and not table.fits(sid, width, height):
+            return "EASY_NO"
+    return None
+
+
+def rule_checkerboard(shapes, width, height, counts):
+    """
+    EASY_NO: checkerboard colouring bound. Every placement covers b black and
+    n - b white cells, where b takes one of a few values per shape. The sum
+    of the black cells over all copies must land in the window the board
+    allows; reachable sums are tracked as a bitset.
+    """
+    area = width * height
+    black_cells = (area + 1) // 2
+    white_cells = area - black_cells
+    table = get_placement_table(shapes)
+    needed = 0
+    reachable = 1  # bit k set: a total of k black cells is reachable
+    for sid, cnt in enumerate(counts):
+        if not cnt:
+            continue
+        n = table.cells[sid]
+        options = set()
+        for orient in table.orientations[sid]:
+            b = sum(1 for r, c in orient if (r + c) % 2 == 0)
+            options.update((b, n - b))
+        for _ in range(cnt):
+            step = 0
+            for b in options:
+                step |= reachable << b
+            reachable = step
+        needed += n * cnt
+    # black total must satisfy needed - white_cells <= total <= black_cells
+    low = max(needed - white_cells, 0)
+    if black_cells >= low and (reachable >> low) & ((1 << (black_cells - low + 1)) - 1):
+        return None
+    return "EASY_NO"
+
+
+def rule_grid_3x3(shapes, width, height, counts):
+    """
+    EASY_YES: every copy gets its own 3x3 cell of a grid laid over the board
+    (returned with the packing: one placement per cell at (3i, 3j)).
+    """
+    columns = width // 3
+    if sum(counts) > columns * (height // 3):
+        return None
+    table = get_placement_table(shapes)
+    packing = []
+    for sid, cnt in enumerate(counts):
+        if not cnt:
+            continue
+        orient = next((o for o in table.orientations[sid] if max(r for r, c in o) < 3 and max(c for r, c in o) < 3),
+                      None)
+        if orient is None:  # shape larger than a grid cell
+            return None
+        base = coords_to_mask(orient, width)
+        for iid in range(cnt):
+            cell = len(packing)
+            packing.append((sid, iid, base << (3 * (cell // columns) * width + 3 * (cell % columns))))
+    return "EASY_YES", packing
+
+
+def rule_pair_tiles(shapes, width, height, counts):
+    """
+    EASY_YES: pair up copies whose shapes interlock into a 3x5 tile (instead
+    of two 3x3 tiles), then fill strips of height 3 with 5-wide pair tiles
+    and 3-wide single tiles.
+    """
+    table = get_placement_table(shapes)
+    remaining = list(counts)
+    pairs = 0
+    ids = [sid for sid, cnt in enumerate(counts) if cnt]
+    for i, a in enumerate(ids):
+        for b in ids[i:]:
+            if not table.fit_together(a, b, 5, 3):
+                continue
+            k = remaining[a] // 2 if a == b else min(remaining[a], remaining[b])
+            remaining[a] -= k
+            remaining[b] -= k
+            pairs += k
+    singles = sum(remaining)
+
+    for strip_len, strips in ((width, height // 3), (height, width // 3)):
+        p, q = pairs, singles
+        for _ in range(strips):
+            room = strip_len
+            take = min(p, room // 5)
+            p -= take
+            room -= 5 * take
+            q -= min(q, room // 3)
+        if p == 0 and q == 0:
+            return "EASY_YES"
+    return None
+
+
+def rule_greedy_pack(shapes, width, height, counts):
+    """EASY_YES: a first-fit packing in scan order places every copy (returned with the verdict)."""
+    packing = greedy_pack(shapes, width, height, counts)
+    if packing is not None:
+        return "EASY_YES", packing
+    return None
+
+
+def greedy_pack(shapes, width, height, counts):
+    """
+    First-fit bitboard packer: copies go largest shape first, each into the
+    placement whose first cell comes earliest in scan order. Occupied cells
+    only grow, so a per-shape cursor never has to revisit a placement.
+    Returns a solution list of (shape_id, instance_id, mask) or None.
+    """
+    table = get_placement_table(shapes)
+    order = sorted((sid for sid, cnt in enumerate(counts) if cnt), key=lambda sid: -table.cells[sid])
+    occupied = 0
+    solution = []
+    for sid in order:
+        masks = table.scan_order_masks(sid, width, height)
+        cursor = 0
+        for iid in range(counts[sid]):
+            while cursor < len(masks) and masks[cursor] & occupied:
+                cursor += 1
+            if cursor == len(masks):
+                return None
+            occupied |= masks[cursor]
+            solution.append((sid, iid, masks[cursor]))
+    return solution
+
+
+def _isolated_free_cells(occupied, width, height):
+    """Count free cells whose four neighbours are all occupied or off the board."""
+    full = (1 << (width * height)) - 1
+    col0 = 0
+    for r in range(height):
+        col0 |= 1 << (r * width)
+    last_col = col0 << (width - 1)
+    free = ~occupied & full
+    neighbours = ((free << 1) & ~col0) | ((free >> 1) & ~last_col) | (free << width) | (free >> width)
+    return (free & ~neighbours).bit_count()
+
+
+def beam_pack(shapes, width, height, counts, beam_width=8, branch=4, time_budget=0.2):
+    """
+    Heuristic constructive packer: beam search over the copies (largest shape
+    first). Every state expands into its first `branch` free placements in
+    scan order (bottom-left style fill) and only the `beam_width` states with
+    the fewest isolated free cells survive. Gives up (None) when the beam
+    dies out or time_budget seconds are spent; never proves infeasibility.
+    """
+    deadline = time.time() + time_budget
+    table = get_placement_table(shapes)
+    order = sorted((sid for sid, cnt in enumerate(counts) if cnt), key=lambda sid: -table.cells[sid])
+    masks = {sid: table.scan_order_masks(sid, width, height) for sid in order}
+
+    # state: (occupied, solution, cursor) - cursor skips placements that
+    # already overlapped an ancestor (occupied cells only grow)
+    beam = [(0, [], {sid: 0 for sid in order})]
+    for sid in order:
+        shape_masks = masks[sid]
+        for iid in range(counts[sid]):
+            if time.time() > deadline:
+                return None
+            children = {}
+            for occupied, solution, cursor in beam:
+                idx = cursor[sid]
+                while idx < len(shape_masks) and shape_masks[idx] & occupied:
+                    idx += 1
+                first_free = idx
+                taken = 0
+                while idx < len(shape_masks) and taken < branch:
+                    mask = shape_masks[idx]
+                    idx += 1
+                    if mask & occupied:
+                        continue
+                    taken += 1
+                    child = occupied | mask
+                    if child not in children:
+                        children[child] = (solution + [(sid, iid, mask)], {**cursor, sid: first_free})
+            if not children:
+                return None
+            scored = sorted(children, key=lambda occ: (_isolated_free_cells(occ, width, height), occ.bit_length()))
+            beam = [(occ, *children[occ]) for occ in scored[:beam_width]]
+    return beam[0][1]
+
+
+CLASSIFIER_RULES = [
+    ("cell_count", rule_cell_count),
+    ("dimensions", rule_dimensions),
+    ("checkerboard", rule_checkerboard),
+    ("grid_3x3", rule_grid_3x3),
+    ("pair_tiles", rule_pair_tiles),
+    ("greedy_pack", rule_greedy_pack),
+]
+
+
+def classify_region_with_rule(shapes, width, height, counts, rules=None, packing=None):
+    """
+    Run the rule pipeline; return (classification, name of the deciding rule or None).
+    packing: optional list, receives the packing when the deciding rule built one.
+    """
+    for name, rule in (CLASSIFIER_RULES if rules is None else rules):
+        verdict = rule(shapes, width, height, counts)
+        if isinstance(verdict, tuple):
+            verdict, found = verdict
+            if packing is not None:
+                packing.extend(found)
+        if verdict is not None:
+            return verdict, name
+    return "NEEDS_DLX", None
+
+
+def classify_region(shapes, width, height, counts, rules=None):
     """
     Classify region into three categories:
-    1. EASY_YES: Obviously solvable (conservative space check with 3x3 per shape)
-    2. EASY_NO: Obviously impossible (too many # cells to fit)
+    1. EASY_YES: Obviously solvable (3x3 grid, pair tiles or greedy packing)
+    2. EASY_NO: Obviously impossible (too many # cells, too thin, colouring)
     3. NEEDS_DLX: Requires actual solving
     """
-    area = width * height
-    
-    # Count total # cells needed
-    total_cells_needed = 0
-    for shape_id, count in enumerate(counts):
-        if count > 0:
-            shape_matrix = shapes[shape_id]
-            cells_per_shape = sum(row.count('#') for row in shape_matrix)
-            total_cells_needed += cells_per_shape * count
-    
-    # EASY_NO: More cells needed than available area
-    if total_cells_needed > area:
-        return "EASY_NO"
-    
-    # Conservative check: assume each shape needs full 3x3 grid
-    total_shapes = sum(counts)
-    conservative_area_needed = total_shapes * 9  # 3x3 per shape
-    
-    # EASY_YES: Even with conservative 3x3 per shape, everything fits
-    if conservative_area_needed <= area:
-        return "EASY_YES"
-    
-    # NEEDS_DLX: Not obviously yes or no
-    return "NEEDS_DLX"
+    return classify_region_with_rule(shapes, width, height, counts, rules)[0]
 
 
-def solve():
-    file_path = "./input_12.txt"
+# --- Persistent region result cache ---
+
+# Bump whenever a solver change can alter cached verdicts
+# 2: set-placement DLX checks overlap through secondary cell columns
+CACHE_VERSION = 2
+
+
+class RegionCache:
+    """
+    On-disk cache of exact verdicts, keyed by shape set hash + sorted board
+    dimensions + counts vector. Besides exact hits it reuses monotonicity:
+    a packing of counts c on a board also packs any dominated counts on any
+    board at least as large, and if c does not fit, no dominating counts
+    fit on a board at most as large. Only SOLVED / IMPOSSIBLE are stored.
+    Files written with another CACHE_VERSION are discarded: verdicts of an older
+    solver are not trusted (and monotonicity would spread them).
+    """
+    def __init__(self, path, shapes):
+        self.path = path
+        self.shape_key = shapes_signature(shapes)
+        self.data = {"version": CACHE_VERSION, "shapes": {}}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.data = data
+        self.entries = self.data["shapes"].setdefault(self.shape_key, [])
+        self.exact = {(tuple(e["dims"]), tuple(e["counts"])): e for e in self.entries}
+
+    def lookup(self, width, height, counts):
+        """Return (verdict, solution or None) or None when nothing is known."""
+        dims = tuple(sorted((width, height)))
+        counts = tuple(counts)
+        entry = self.exact.get((dims, counts))
+        if entry is not None:
+            solution = None
+            if entry.get("solution") is not None and (entry["width"], entry["height"]) == (width, height):
+                solution = [tuple(item) for item in entry["solution"]]
+            return entry["verdict"], solution
+        for entry in self.entries:
+            small, large = entry["dims"]
+            if len(entry["counts"]) != len(counts):
+                continue
+            if entry["verdict"] == SOLVED:
+                if small <= dims[0] and large <= dims[1] and all(a <= b for a, b in zip(counts, entry["counts"])):
+                    return SOLVED, None
+            elif dims[0] <= small and dims[1] <= large and all(a >= b for a, b in zip(counts, entry["counts"])):
+                return IMPOSSIBLE, None
+        return None
+
+    def store(self, width, height, counts, verdict, solution=None):
+        if verdict not in (SOLVED, IMPOSSIBLE):
+            return
+        entry = {
+            "dims": sorted((width, height)),
+            "width": width,
+            "height": height,
+            "counts": list(counts),
+            "verdict": verdict,
+            "solution": None,
+        }
+        if solution is not None:
+            entry["solution"] = [
+                [sid, iid, placement if isinstance(placement, int) else coords_to_mask(placement, width)]
+                for sid, iid, placement in solution
+            ]
+        key = (tuple(entry["dims"]), tuple(counts))
+        if key in self.exact:
+            self.entries.remove(self.exact[key])
+        self.entries.append(entry)
+        self.exact[key] = entry
+
+    def save(self):
+        with open(self.path, "w") as f:
+            json.dump(self.data, f)
+
+
+def _progress_printer(region_idx, every_secs):
+    """progress_cb printing a live stats line to stderr at most every every_secs seconds."""
+    last = [time.time()]
+
+    def show(stats):
+        now = time.time()
+        if now - last[0] >= every_secs:
+            last[0] = now
+            print(f"  ... region {region_idx + 1}: {stats['nodes']} nodes ({stats['nodes_per_sec']:.0f}/s), "
+                  f"depth {stats['depth']} (best {stats['best_depth']}), {stats['elapsed']:.0f}s",
+                  file=sys.stderr, flush=True)
+    return show
+
+
+def _solve_region_task(task):
+    """Process-pool worker: solve one NEEDS_DLX region, return (idx, solution, seconds, tracker)."""
+    region_idx, shapes, width, height, counts, fast_path_secs, backend, progress_secs, solver_options = task
+    tracker = {}
+    start = time.time()
+    solution = None
+    if fast_path_secs:
+        solution = beam_pack(shapes, width, height, counts, time_budget=fast_path_secs)
+        tracker["fast_path_secs"] = time.time() - start
+        if solution is not None:
+            tracker.update(status=SOLVED, nodes=0, fast_path=True)
+    if solution is None:
+        if progress_secs:
+            solver_options = {**solver_options, "progress_cb": _progress_printer(region_idx, progress_secs)}
+        solution = solve_region(shapes, width, height, counts, backend, tracker=tracker, **solver_options)
+    return region_idx, solution, time.time() - start, tracker
+
+
+def solve(file_path="./input_12.txt", parallel=False, workers=None, fast_path_secs=0.2, cache_path=None,
+          backend="dlx", export_path=None, progress_secs=0, telemetry_path=None, **solver_options):
+    """
+    parallel: farm the NEEDS_DLX regions out to a process pool with `workers`
+    processes (default: all cores); results are printed as they finish.
+    fast_path_secs: time budget of the beam_pack heuristic tried before the
+    exact search (0 disables it).
+    cache_path: JSON file with earlier verdicts (RegionCache), updated at the end.
+    backend: exact solver used through solve_region ("dlx", "algorithm_x", "sat", "frontier").
+    export_path: write every packing found to this solution file (.npz with
+    numpy, compact struct records otherwise; see solution_file.py).
+    progress_secs: print live search stats of running regions to stderr at
+    most this often (0: off).
+    telemetry_path: append one JSON line per solved region (status, nodes,
+    nodes/sec, depths, covers/uncovers, build vs search seconds, ...).
+    solver_options are passed to the backend (bitboard, node_budget, timeout_secs, ...).
+    """
     # file_path = "./test_12.txt"
 
-    shapes = read_shapes(file_path)
-    regions = read_regions(file_path)
+    # Single pass: shapes now, regions streamed while phase 1 runs
+    malformed = []
+    shapes, region_stream = stream_input(file_path, malformed)
 
     print("=" * 60)
     print("SHAPE FITTING PUZZLE SOLVER")
@@ -517,64 +1873,184 @@ def solve():
         print("    +" + "-" * w + "+")
 
     print("\n" + "=" * 60)
-    print(f"Processing {len(regions)} region(s)...")
+    print("Processing regions...")
     print("=" * 60)
     
-    # First pass: classify all regions
+    total_time = 0
+    dlx_solved = 0
+    dlx_gave_up = 0
+    total_nodes = 0
+    fast_path_hits = 0
+    cache_hits = 0
+    cache = RegionCache(cache_path, shapes) if cache_path else None
+    regions = []
+    records = []
+    telemetry = open(telemetry_path, "a") if telemetry_path else None
+
+    def cached_result(task):
+        """Result tuple for a task answered by the cache, or None."""
+        region_idx, _, width, height, counts = task[:5]
+        hit = cache.lookup(width, height, counts) if cache else None
+        if hit is None:
+            return None
+        verdict, solution = hit
+        if verdict == SOLVED and solution is None:
+            solution = []  # known to fit, placement not stored for this board
+        return region_idx, solution if verdict == SOLVED else None, 0.0, {"status": verdict, "cached": True}
+
+    def report(region_idx, solution, elapsed, tracker):
+        nonlocal total_time, solved_count, dlx_solved, dlx_gave_up, total_nodes, fast_path_hits, cache_hits
+        width, height, counts = regions[region_idx]
+        total_time += elapsed
+        total_nodes += tracker.get("nodes", 0)
+        cache_hits += bool(tracker.get("cached"))
+        if telemetry:
+            telemetry.write(json.dumps({"region": region_idx, "width": width, "height": height,
+                                        "counts": counts, "backend": backend, "elapsed": elapsed,
+                                        **tracker}) + "\n")
+            telemetry.flush()
+        if cache and not tracker.get("cached"):
+            cache.store(width, height, counts, tracker.get("status"), solution)
+        if solution is not None:
+            if tracker.get("cached"):
+                mark = "✓ (cached)"
+            else:
+                mark = "✓ (fast path)" if tracker.get("fast_path") else "✓"
+            fast_path_hits += bool(tracker.get("fast_path"))
+            if export_path and solution:
+                records.append(solution_record(shapes, region_idx, width, height, counts, solution))
+            solved_count += 1
+            dlx_solved += 1
+        elif tracker.get("status") == BUDGET_EXHAUSTED:
+            mark = "⏱"
+            dlx_gave_up += 1
+        else:
+            mark = "✗ (cached)" if tracker.get("cached") else "✗"
+        print(f"Region {region_idx + 1}/{len(regions)}: {width}x{height}, {sum(counts)} shapes ... "
+              f"{mark} {elapsed:.2f}s, {tracker.get('nodes', 0)} nodes", flush=True)
+
+    # With parallel, NEEDS_DLX regions are submitted while the file is still being classified
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers) if parallel else None
+    futures = []
+    ready = []  # cache answers, reported after phase 1
+    wall_start = time.time()
+
+    # First pass: classify the regions as they are read
     print("\n[PHASE 1] Classifying regions...")
     easy_yes = []
     easy_no = []
     needs_dlx = []
+    decided_by = {}
     
-    for idx, (width, height, counts) in enumerate(regions):
-        classification = classify_region(shapes, width, height, counts)
+    for idx, (width, height, counts) in enumerate(region_stream):
+        regions.append((width, height, counts))
+        packing = []
+        classification, rule_name = classify_region_with_rule(shapes, width, height, counts, packing=packing)
+        if rule_name:
+            decided_by[rule_name] = decided_by.get(rule_name, 0) + 1
         if classification == "EASY_YES":
             easy_yes.append(idx)
+            if export_path and packing:
+                records.append(solution_record(shapes, idx, width, height, counts, packing))
         elif classification == "EASY_NO":
             easy_no.append(idx)
         else:
             needs_dlx.append(idx)
+            if pool:
+                task = (idx, shapes, width, height, counts, fast_path_secs, backend, progress_secs, solver_options)
+                result = cached_result(task)
+                if result is not None:
+                    ready.append(result)
+                else:
+                    futures.append(pool.submit(_solve_region_task, task))
     
+    print(f"  Read {len(regions)} region(s)")
+    for line_no, line in malformed:
+        print(f"  ! skipped malformed line {line_no}: {line!r}")
     print(f"  ✓ EASY_YES (obviously solvable): {len(easy_yes)} regions")
     print(f"  ✗ EASY_NO (obviously impossible): {len(easy_no)} regions")
     print(f"  ? NEEDS_DLX (requires solving): {len(needs_dlx)} regions")
+    for rule_name, _ in CLASSIFIER_RULES:
+        if rule_name in decided_by:
+            print(f"    decided by {rule_name}: {decided_by[rule_name]}")
     
     # Second pass: solve NEEDS_DLX regions
-    print(f"\n[PHASE 2] Solving {len(needs_dlx)} regions with DLX...")
-    
+    print(f"\n[PHASE 2] Solving {len(needs_dlx)} regions with {backend}...")
     solved_count = len(easy_yes)  # Start with easy yeses
-    total_time = 0
-    dlx_solved = 0
 
-    for region_idx in needs_dlx:
-        width, height, counts = regions[region_idx]
-        print(f"Region {region_idx + 1}/{len(regions)}: {width}x{height}, {sum(counts)} shapes", end=" ... ", flush=True)
-        
-        import time
-        start = time.time()
-        solution = solve_with_dlx(shapes, width, height, counts, require_full_cover=False)
-        elapsed = time.time() - start
-        total_time += elapsed
-        
-        if solution:
-            print(f"✓ {elapsed:.2f}s")
-            solved_count += 1
-            dlx_solved += 1
-        else:
-            print(f"✗ {elapsed:.2f}s")
+    if pool:
+        print(f"  Using {workers} worker process(es)")
+        with pool:
+            for result in ready:
+                report(*result)
+            for future in as_completed(futures):
+                report(*future.result())
+    else:
+        for idx in needs_dlx:
+            task = (idx, shapes, *regions[idx], fast_path_secs, backend, progress_secs, solver_options)
+            report(*(cached_result(task) or _solve_region_task(task)))
+    wall_time = time.time() - wall_start
+    if cache:
+        cache.save()
+    if telemetry:
+        telemetry.close()
+    if export_path:
+        write_solutions(export_path, sorted(records, key=lambda rec: rec["region"]), len(shapes))
 
     print("\n" + "=" * 60)
     print("FINAL RESULTS:")
-    print(f"  Easy YES (conservative fit): {len(easy_yes)}")
-    print(f"  Easy NO (too many cells): {len(easy_no)}")
+    print(f"  Easy YES (pre-classifier): {len(easy_yes)}")
+    print(f"  Easy NO (pre-classifier): {len(easy_no)}")
     print(f"  DLX solved: {dlx_solved} / {len(needs_dlx)}")
-    print(f"  DLX failed: {len(needs_dlx) - dlx_solved}")
+    if fast_path_secs and needs_dlx:
+        print(f"    via fast path: {fast_path_hits} ({100 * fast_path_hits / len(needs_dlx):.0f}% hit rate)")
+    if cache:
+        print(f"  Answered from cache: {cache_hits} / {len(needs_dlx)}")
+    if export_path:
+        print(f"  Packings written to {export_path}: {len(records)}")
+        if solved_count > len(records):
+            print(f"    solvable regions without a packing: {solved_count - len(records)}")
+    print(f"  DLX failed: {len(needs_dlx) - dlx_solved - dlx_gave_up}")
+    if dlx_gave_up:
+        print(f"  DLX budget exhausted (unknown): {dlx_gave_up}")
     print(f"---")
     print(f"Total solvable regions: {solved_count} / {len(regions)}")
     if len(needs_dlx) > 0:
-        print(f"DLX time: {total_time:.2f}s (avg {total_time/len(needs_dlx):.2f}s per region)")
+        print(f"DLX time: {total_time:.2f}s (avg {total_time/len(needs_dlx):.2f}s per region, {total_nodes} nodes)")
+        if parallel:
+            print(f"DLX wall time: {wall_time:.2f}s")
     print("=" * 60)
 
 
 if __name__ == "__main__":
-    solve()
+    parser = argparse.ArgumentParser(description="Puzzle 12 - Exercise 01")
+    parser.add_argument("input", nargs="?", default="./input_12.txt", help="puzzle input file")
+    parser.add_argument("--bitboard", action="store_true", help="use bitboard placements")
+    parser.add_argument("--symmetry", action="store_true", help="break symmetry between copies of a shape")
+    parser.add_argument("--parallel", action="store_true", help="solve NEEDS_DLX regions in a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--fast-path-secs", type=float, default=0.2,
+                        help="time budget of the heuristic packer tried before exact search (0: off)")
+    parser.add_argument("--cache", default=None, help="JSON file caching region verdicts across runs")
+    parser.add_argument("--node-budget", type=int, default=None, help="give up on a region after N search nodes")
+    parser.add_argument("--timeout", type=float, default=None, help="give up on a region after N seconds")
+    parser.add_argument("--transposition", type=int, default=None, metavar="N",
+                        help="dlx with --bitboard / frontier: remember up to N dead search states")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="dlx", help="exact solver (default: dlx)")
+    parser.add_argument("--export", default=None, help="write found packings to a solution file (.npz or binary)")
+    parser.add_argument("--progress", type=float, default=0, metavar="SECS",
+                        help="print live search stats of running regions every SECS seconds")
+    parser.add_argument("--telemetry", default=None, help="append per-region stats as JSON lines to this file")
+    parser.add_argument("--sat-solver", choices=["auto", "pysat", "cpsat", "builtin"], default="auto",
+                        help="solver behind --backend sat (auto: first installed, else builtin)")
+    args = parser.parse_args()
+    backend_options = {}
+    if args.backend == "sat":
+        backend_options["sat_solver"] = args.sat_solver
+    if args.transposition:
+        backend_options["transposition"] = args.transposition
+    solve(args.input, parallel=args.parallel, workers=args.workers, fast_path_secs=args.fast_path_secs,
+          cache_path=args.cache, backend=args.backend, export_path=args.export,
+          progress_secs=args.progress, telemetry_path=args.telemetry, bitboard=args.bitboard,
+          symmetry=args.symmetry, node_budget=args.node_budget, timeout_secs=args.timeout, **backend_options)
@@ -0,0 +1,584 @@
+"""
+Puzzle 12 - SAT backend
+
+CNF encoding of the region packing problem plus a small built-in CDCL
+solver. The encoding is handed to PySAT or OR-Tools CP-SAT when one of
+them is installed, otherwise to the built-in solver.
+
+Encoding (copies of a shape are a multiset, so no instance symmetry):
+- one variable per placement of every needed shape
+- at most one placement per board cell (sequential counter)
+- at least `count` placements per shape (sequential counter)
+
+This module has no dependency on exercise_01: it works on plain bitboard
+placement lists.
+"""
+
+import threading
+import time
+
+SOLVED = "SOLVED"
+IMPOSSIBLE = "IMPOSSIBLE"
+BUDGET_EXHAUSTED = "BUDGET_EXHAUSTED"
+
+# Learnt clause deletion: first after REDUCE_FIRST conflicts, then the gap
+# grows with the number of learnt clauses kept
+REDUCE_FIRST = 2000
+REDUCE_STEP = 30
+
+
+class CNF:
+    """Clause list with a variable counter (DIMACS-style literals)."""
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses = []
+
+    def new_var(self):
+        self.num_vars += 1
+        return self.num_vars
+
+    def add(self, clause):
+        self.clauses.append(list(clause))
+
+
+def add_at_most_one(cnf, lits):
+    """At most one of lits is true (pairwise for short lists, else Sinz's sequential counter)."""
+    n = len(lits)
+    if n <= 1:
+        return
+    if n <= 5:
+        for i in range(n):
+            for j in range(i + 1, n):
+                cnf.add((-lits[i], -lits[j]))
+        return
+    prev = cnf.new_var()
+    cnf.add((-lits[0], prev))
+    for i in range(1, n - 1):
+        cur = cnf.new_var()
+        cnf.add((-lits[i], cur))
+        cnf.add((-prev, cur))
+        cnf.add((-lits[i], -prev))
+        prev = cur
+    cnf.add((-lits[-1], -prev))
+
+
+def add_at_least(cnf, lits, k):
+    """
+    At least k of lits are true. Sequential counter: r[j] after literal i
+    means "at least j+1 of the first i literals are true"; it may only hold
+    if it already held before or the literal extends a count of j.
+    """
+    n = len(lits)
+    if k <= 0:
+        return
+    if k > n:
+        cnf.add(())
+        return
+    if k == 1:
+        cnf.add(lits)
+        return
+    prev = []  # counter variables after the previous literal (None: not tracked)
+    for i, lit in enumerate(lits):
+        # No need to count above k, nor to track counts below k - (n - i - 1):
+        # with n - i - 1 literals left those can no longer reach k
+        top = min(i + 1, k)
+        low = max(0, k - (n - i))
+        cur = [None] * low + [cnf.new_var() for _ in range(top - low)]
+        for j in range(low, top):
+            r = cur[j]
+            if j == 0:
+                # at least 1 so far -> earlier at least 1, or this literal
+                cnf.add([-r, lit] + ([prev[0]] if prev else []))
+            else:
+                # at least j+1 -> earlier at least j+1, or (earlier at least j and this literal)
+                earlier = [prev[j]] if j < len(prev) else []
+                cnf.add([-r] + earlier + [prev[j - 1]])
+                cnf.add([-r] + earlier + [lit])
+        prev = cur
+    cnf.add((prev[k - 1],))
+
+
+def encode_packing(placements, counts, area):
+    """
+    placements: {shape_id: [bitboard, ...]}; counts: copies per shape id.
+    Returns (cnf, var_of) where var_of maps variable -> (shape_id, mask).
+    """
+    cnf = CNF()
+    var_of = {}
+    by_cell = [[] for _ in range(area)]
+    for sid, masks in placements.items():
+        lits = []
+        for mask in masks:
+            var = cnf.new_var()
+            var_of[var] = (sid, mask)
+            lits.append(var)
+            m = mask
+            while m:
+                low = m & -m
+                by_cell[low.bit_length() - 1].append(var)
+                m ^= low
+        add_at_least(cnf, lits, counts[sid])
+    for lits in by_cell:
+        add_at_most_one(cnf, lits)
+    return cnf, var_of
+
+
+class _VarHeap:
+    """Binary max-heap of variables by activity, with a position index (no duplicate entries)."""
+    def __init__(self, activity, variables):
+        self.activity = activity
+        self.heap = []
+        self.pos = [-1] * len(activity)
+        for var in variables:
+            self.push(var)
+
+    def __contains__(self, var):
+        return self.pos[var] >= 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, var):
+        if self.pos[var] < 0:
+            self.heap.append(var)
+            self.pos[var] = len(self.heap) - 1
+            self._up(self.pos[var])
+
+    def increased(self, var):
+        """Restore the heap order after activity[var] went up."""
+        if self.pos[var] >= 0:
+            self._up(self.pos[var])
+
+    def pop(self):
+        heap, pos = self.heap, self.pos
+        top = heap[0]
+        last = heap.pop()
+        pos[top] = -1
+        if heap:
+            heap[0] = last
+            pos[last] = 0
+            self._down(0)
+        return top
+
+    def _up(self, i):
+        heap, pos, act = self.heap, self.pos, self.activity
+        var = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if act[heap[parent]] >= act[var]:
+                break
+            heap[i] = heap[parent]
+            pos[heap[i]] = i
+            i = parent
+        heap[i] = var
+        pos[var] = i
+
+    def _down(self, i):
+        heap, pos, act = self.heap, self.pos, self.activity
+        var = heap[i]
+        n = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and act[heap[child + 1]] > act[heap[child]]:
+                child += 1
+            if act[heap[child]] <= act[var]:
+                break
+            heap[i] = heap[child]
+            pos[heap[i]] = i
+            i = child
+        heap[i] = var
+        pos[var] = i
+
+
+class CDCLSolver:
+    """
+    Minimal CDCL: two watched literals, first-UIP learning with recursive
+    clause minimisation, VSIDS activity on an indexed heap, phase saving
+    (default false), Luby restarts and periodic deletion of learnt clauses
+    by LBD (number of decision levels in the clause).
+    """
+    def __init__(self, num_vars, clauses, prefer=()):
+        # prefer: variables decided first, true first (the placement variables)
+        self.num_vars = num_vars
+        # Indexed by literal: value[lit] / value[-lit] share one list through
+        # negative indexing (1 true, -1 false, 0 unassigned); same for watches
+        self.value = [0] * (2 * num_vars + 2)
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.phase = [-1] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.bump = 1.0
+        for var in prefer:
+            self.activity[var] = 1.0
+            self.phase[var] = 1
+        self.order = _VarHeap(self.activity, range(1, num_vars + 1))
+        self.watches = [[] for _ in range(2 * num_vars + 2)]
+        self.clauses = []  # deleted learnt clauses become None
+        self.learnts = []  # indices of live learnt clauses
+        self.lbd = {}  # learnt clause index -> LBD
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.conflicts = 0
+        self.ok = True
+        units = []
+        for clause in clauses:
+            clause = list(dict.fromkeys(clause))
+            if any(-lit in clause for lit in clause):
+                continue  # tautology
+            if len(clause) < 2:
+                if not clause:
+                    self.ok = False
+                units.extend(clause)
+                continue
+            self._attach(clause)
+        # Units go in once every clause is watched, so propagation sees them all
+        for lit in units:
+            val = self.value[lit]
+            if val == -1:
+                self.ok = False
+            elif val == 0:
+                self._assign(lit, None)
+
+    def _attach(self, clause):
+        idx = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(idx)
+        self.watches[clause[1]].append(idx)
+        return idx
+
+    def _assign(self, lit, reason):
+        var = abs(lit)
+        self.value[lit] = 1
+        self.value[-lit] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        """Unit propagation; returns a conflicting clause index or None."""
+        clauses, watches, value = self.clauses, self.watches, self.value
+        while self.qhead < len(self.trail):
+            false_lit = -self.trail[self.qhead]
+            self.qhead += 1
+            watching = watches[false_lit]
+            if not watching:
+                continue
+            keep = []
+            i = 0
+            while i < len(watching):
+                idx = watching[i]
+                i += 1
+                clause = clauses[idx]
+                if clause is None:
+                    continue  # deleted learnt clause, dropped from this watch list
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], clause[0]
+                first = clause[0]
+                if value[first] == 1:
+                    keep.append(idx)
+                    continue
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if value[lit] != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit].append(idx)
+                        break
+                else:
+                    keep.append(idx)
+                    if value[first] == -1:
+                        keep.extend(watching[i:])
+                        watches[false_lit] = keep
+                        return idx
+                    self._assign(first, idx)
+            watches[false_lit] = keep
+        return None
+
+    def _bump(self, var):
+        activity = self.activity
+        activity[var] += self.bump
+        if activity[var] > 1e100:
+            # Rescale in place: the heap shares this list and the order is unchanged
+            for v in range(1, self.num_vars + 1):
+                activity[v] *= 1e-100
+            self.bump *= 1e-100
+        self.order.increased(var)
+
+    def _analyze(self, conflict):
+        """First-UIP learning and minimisation; returns (learnt clause, backjump level, LBD)."""
+        seen = set()
+        learnt = [None]
+        counter = 0
+        current = len(self.trail_lim)
+        clause = self.clauses[conflict]
+        idx = len(self.trail) - 1
+        lit = None
+        while True:
+            for q in clause:
+                if lit is not None and q == lit:
+                    continue
+                var = abs(q)
+                if var in seen or self.level[var] == 0:
+                    continue
+                seen.add(var)
+                self._bump(var)
+                if self.level[var] == current:
+                    counter += 1
+                else:
+                    learnt.append(q)
+            # Next literal of the current level on the trail
+            while abs(self.trail[idx]) not in seen:
+                idx -= 1
+            lit = self.trail[idx]
+            idx -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reason[abs(lit)]]
+        learnt[0] = -lit
+        self.bump *= 1.05
+
+        # Drop literals implied by the rest of the clause (MiniSat's recursive minimisation)
+        levels = 0
+        for q in learnt[1:]:
+            levels |= 1 << (self.level[abs(q)] & 31)
+        learnt[1:] = [q for q in learnt[1:]
+                      if self.reason[abs(q)] is None or not self._redundant(q, levels, seen)]
+
+        lbd = len({self.level[abs(q)] for q in learnt})
+        if len(learnt) == 1:
+            return learnt, 0, lbd
+        # Watch the literal with the highest level as the second literal
+        best = max(range(1, len(learnt)), key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[abs(learnt[1])], lbd
+
+    def _redundant(self, lit, levels, seen):
+        """
+        True if lit follows from literals already in the learnt clause, through
+        reason clauses. levels: bit set of the clause's decision levels (mod 32);
+        a literal on any other level cannot be implied by the clause.
+        """
+        stack = [lit]
+        added = []
+        while stack:
+            clause = self.clauses[self.reason[abs(stack.pop())]]
+            for q in clause[1:]:  # clause[0] is the implied literal
+                var = abs(q)
+                if var in seen or self.level[var] == 0:
+                    continue
+                if self.reason[var] is not None and levels >> (self.level[var] & 31) & 1:
+                    seen.add(var)
+                    added.append(var)
+                    stack.append(q)
+                else:
+                    seen.difference_update(added)
+                    return False
+        return True
+
+    def _reduce(self):
+        """Delete the worse half of the learnt clauses (highest LBD); keep glue clauses and reasons."""
+        def locked(idx):
+            first = self.clauses[idx][0]
+            return self.reason[abs(first)] == idx and self.value[first] == 1
+
+        ranked = sorted(self.learnts, key=lambda idx: -self.lbd[idx])
+        doomed = set()
+        for idx in ranked[:len(ranked) // 2]:
+            if self.lbd[idx] > 2 and not locked(idx):
+                doomed.add(idx)
+        for idx in doomed:
+            self.clauses[idx] = None
+            del self.lbd[idx]
+        self.learnts = [idx for idx in self.learnts if idx not in doomed]
+
+    def _backtrack(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = abs(lit)
+            self.phase[var] = self.value[var]
+            self.value[var] = self.value[-var] = 0
+            self.reason[var] = None
+            self.order.push(var)
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    def _pick(self):
+        while self.order:
+            var = self.order.pop()
+            if not self.value[var]:
+                return var if self.phase[var] > 0 else -var
+        return None
+
+    @staticmethod
+    def _luby(i):
+        size, seq = 1, 0
+        while size < i + 1:
+            seq += 1
+            size = 2 * size + 1
+        while size - 1 != i:
+            size = (size - 1) >> 1
+            seq -= 1
+            i %= size
+        return 2 ** seq
+
+    def solve(self, conflict_budget=None, deadline=None):
+        """Return (status, model) where model maps var -> bool when SOLVED."""
+        if not self.ok or self._propagate() is not None:
+            return IMPOSSIBLE, None
+        restarts = 0
+        limit = 100 * self._luby(restarts)
+        since_restart = 0
+        next_reduce = REDUCE_FIRST
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if not self.trail_lim:
+                    return IMPOSSIBLE, None
+                learnt, back_level, lbd = self._analyze(conflict)
+                self._backtrack(back_level)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    idx = self._attach(learnt)
+                    self.learnts.append(idx)
+                    self.lbd[idx] = lbd
+                    self._assign(learnt[0], idx)
+                if conflict_budget is not None and self.conflicts >= conflict_budget:
+                    self._backtrack(0)
+                    return BUDGET_EXHAUSTED, None
+                if self.conflicts % 64 == 0 and deadline is not None and time.time() > deadline:
+                    self._backtrack(0)
+                    return BUDGET_EXHAUSTED, None
+                if self.conflicts >= next_reduce:
+                    self._reduce()
+                    next_reduce = self.conflicts + REDUCE_FIRST + REDUCE_STEP * len(self.learnts) // 100
+                continue
+            if since_restart >= limit:
+                restarts += 1
+                limit = 100 * self._luby(restarts)
+                since_restart = 0
+                self._backtrack(0)
+                continue
+            lit = self._pick()
+            if lit is None:
+                return SOLVED, {v: self.value[v] > 0 for v in range(1, self.num_vars + 1)}
+            self.trail_lim.append(len(self.trail))
+            self._assign(lit, None)
+
+
+def available_solvers():
+    """Names of the solvers usable here, preferred first."""
+    names = []
+    try:
+        import pysat.solvers  # noqa: F401
+        names.append("pysat")
+    except ImportError:
+        pass
+    try:
+        from ortools.sat.python import cp_model  # noqa: F401
+        names.append("cpsat")
+    except ImportError:
+        pass
+    names.append("builtin")
+    return names
+
+
+def _solve_pysat(cnf, timeout_secs, conflict_budget):
+    from pysat.solvers import Solver
+
+    with Solver(name="cadical153", bootstrap_with=cnf.clauses) as solver:
+        if conflict_budget is not None:
+            solver.conf_budget(conflict_budget)
+        timer = None
+        if timeout_secs is not None:
+            timer = threading.Timer(timeout_secs, solver.interrupt)
+            timer.start()
+        try:
+            result = solver.solve_limited(expect_interrupt=timer is not None)
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if result is None:
+            return BUDGET_EXHAUSTED, None
+        if not result:
+            return IMPOSSIBLE, None
+        return SOLVED, {abs(lit): lit > 0 for lit in solver.get_model()}
+
+
+def _solve_cpsat(placements, counts, area, timeout_secs):
+    """CP-SAT gets the structured model (native at-most-one and linear counts) rather than CNF."""
+    from ortools.sat.python import cp_model
+
+    model = cp_model.CpModel()
+    chosen = []
+    by_cell = [[] for _ in range(area)]
+    per_shape = {}
+    for sid, masks in placements.items():
+        for mask in masks:
+            var = model.NewBoolVar("")
+            chosen.append((var, sid, mask))
+            per_shape.setdefault(sid, []).append(var)
+            m = mask
+            while m:
+                low = m & -m
+                by_cell[low.bit_length() - 1].append(var)
+                m ^= low
+    for vars_ in by_cell:
+        if len(vars_) > 1:
+            model.AddAtMostOne(vars_)
+    for sid, vars_ in per_shape.items():
+        model.Add(sum(vars_) >= counts[sid])
+    solver = cp_model.CpSolver()
+    if timeout_secs is not None:
+        solver.parameters.max_time_in_seconds = timeout_secs
+    status = solver.Solve(model)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return SOLVED, [(sid, mask) for var, sid, mask in chosen if solver.Value(var)]
+    if status == cp_model.INFEASIBLE:
+        return IMPOSSIBLE, None
+    return BUDGET_EXHAUSTED, None
+
+
+def solve_packing(placements, counts, area, solver="auto", timeout_secs=None, conflict_budget=None, info=None):
+    """
+    Decide whether counts[sid] copies of every shape fit without overlap.
+    placements: {shape_id: [bitboard, ...]} for the shapes with a count.
+    solver: "auto" (first of available_solvers()), "pysat", "cpsat" or "builtin".
+    Returns (status, [(shape_id, mask), ...] or None); info (dict) receives
+    the solver used and its statistics.
+    """
+    if info is None:
+        info = {}
+    if solver == "auto":
+        solver = available_solvers()[0]
+    info["solver"] = solver
+
+    if solver == "cpsat":
+        status, chosen = _solve_cpsat(placements, counts, area, timeout_secs)
+        return status, chosen
+
+    cnf, var_of = encode_packing(placements, counts, area)
+    info["vars"] = cnf.num_vars
+    info["clauses"] = len(cnf.clauses)
+    if solver == "pysat":
+        status, model = _solve_pysat(cnf, timeout_secs, conflict_budget)
+    elif solver == "builtin":
+        deadline = time.time() + timeout_secs if timeout_secs is not None else None
+        cdcl = CDCLSolver(cnf.num_vars, cnf.clauses, prefer=var_of)
+        status, model = cdcl.solve(conflict_budget=conflict_budget, deadline=deadline)
+        info["conflicts"] = cdcl.conflicts
+    else:
+        raise ValueError(f"Unknown SAT solver: {solver}")
+
+    if status != SOLVED:
+        return status, None
+    return status, [var_of[var] for var in sorted(var_of) if model.get(var)]
@@ -0,0 +1,204 @@
+"""
+Puzzle 12 - Solution files
+
+Compact storage of found packings and an independent verifier.
+
+Every region record holds its index, board size and shape counts, and one
+(shape id, orientation id, row offset, col offset) entry per placed copy.
+Orientation ids index the distinct rotations/reflections of a shape sorted
+by their sorted (row, col) cell list, normalised to the top-left corner
+(the order PlacementTable uses); the verifier recomputes them from the
+shape matrices, so it does not trust the solver's geometry.
+
+Two encodings:
+- .npz (needs numpy): arrays "regions" (idx, width, height, counts...) and
+  "placements" (region idx, shape, orientation, row, col)
+- anything else: little-endian struct records, see write_binary()
+
+Usage: python solution_file.py <puzzle input> <solution file> [--show]
+"""
+
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"P12S"
+VERSION = 1
+
+
+def orientation_cells(shape_matrix):
+    """Distinct orientations of a shape matrix as sorted (row, col) lists, in orientation id order."""
+    cells = [(r, c) for r, row in enumerate(shape_matrix) for c, ch in enumerate(row) if ch == "#"]
+    seen = set()
+    for flip in (False, True):
+        current = [(r, -c) for r, c in cells] if flip else cells
+        for _ in range(4):
+            min_r = min(r for r, _ in current)
+            min_c = min(c for _, c in current)
+            seen.add(tuple(sorted((r - min_r, c - min_c) for r, c in current)))
+            current = [(c, -r) for r, c in current]
+    return [list(ori) for ori in sorted(seen)]
+
+
+def write_solutions(path, records, num_shapes):
+    """
+    records: [{"region", "width", "height", "counts", "placements": [(sid, ori, row, col), ...]}, ...]
+    Writes .npz when the path ends in .npz, the struct format otherwise.
+    """
+    if path.endswith(".npz"):
+        if np is None:
+            raise ImportError("numpy is required for .npz solution files")
+        regions = np.array([[rec["region"], rec["width"], rec["height"], *rec["counts"]] for rec in records],
+                           dtype=np.int32).reshape(-1, 3 + num_shapes)
+        placements = np.array([[rec["region"], *p] for rec in records for p in rec["placements"]],
+                              dtype=np.int32).reshape(-1, 5)
+        np.savez_compressed(path, regions=regions, placements=placements)
+    else:
+        with open(path, "wb") as f:
+            write_binary(f, records, num_shapes)
+
+
+def write_binary(f, records, num_shapes):
+    """
+    Header: magic "P12S", version (u8), shape count (u8), region count (u32).
+    Region: index (u32), width, height (u16), counts (u16 each), placement
+    count (u32), then per placement shape, orientation (u8), row, col (u16).
+    """
+    f.write(MAGIC + struct.pack("<BBI", VERSION, num_shapes, len(records)))
+    for rec in records:
+        f.write(struct.pack(f"<IHH{num_shapes}HI", rec["region"], rec["width"], rec["height"],
+                            *rec["counts"], len(rec["placements"])))
+        f.write(b"".join(struct.pack("<BBHH", *p) for p in rec["placements"]))
+
+
+def read_solutions(path):
+    """Load records written by write_solutions (format detected from the file)."""
+    with open(path, "rb") as f:
+        head = f.read(4)
+        if head != MAGIC:
+            if np is None:
+                raise ImportError("numpy is required to read .npz solution files")
+            data = np.load(path)
+            by_region = {}
+            records = []
+            for row in data["regions"].tolist():
+                rec = {"region": row[0], "width": row[1], "height": row[2], "counts": row[3:], "placements": []}
+                by_region[row[0]] = rec
+                records.append(rec)
+            for region, *p in data["placements"].tolist():
+                by_region[region]["placements"].append(tuple(p))
+            return records
+        version, num_shapes, num_regions = struct.unpack("<BBI", f.read(6))
+        if version != VERSION:
+            raise ValueError(f"Unsupported solution file version {version}")
+        region_fmt = struct.Struct(f"<IHH{num_shapes}HI")
+        records = []
+        for _ in range(num_regions):
+            region, width, height, *counts, n = region_fmt.unpack(f.read(region_fmt.size))
+            raw = f.read(6 * n)
+            placements = [struct.unpack_from("<BBHH", raw, 6 * i) for i in range(n)]
+            records.append({"region": region, "width": width, "height": height, "counts": counts,
+                            "placements": placements})
+        return records
+
+
+def verify(shapes, records):
+    """
+    Check every record: known shape and orientation ids, all cells on the
+    board, no cell covered twice, exactly counts[sid] copies of each shape.
+    Returns a list of (region index, problem); empty when all are valid.
+    """
+    oris = {sid: orientation_cells(matrix) for sid, matrix in shapes.items()}
+    check = _verify_numpy if np is not None else _verify_bits
+    problems = []
+    for rec in records:
+        for problem in _check_ids(oris, rec) or check(oris, rec):
+            problems.append((rec["region"], problem))
+    return problems
+
+
+def _check_ids(oris, rec):
+    problems = []
+    if len(rec["counts"]) != len(oris):
+        problems.append(f"{len(rec['counts'])} counts for {len(oris)} shapes")
+    for sid, ori, _, _ in rec["placements"]:
+        if sid not in oris or ori >= len(oris[sid]):
+            problems.append(f"unknown shape/orientation {sid}/{ori}")
+    return problems
+
+
+def _verify_numpy(oris, rec):
+    """Vectorised over all covered cells of the region at once."""
+    width, height = rec["width"], rec["height"]
+    problems = []
+    placements = np.array(rec["placements"], dtype=np.int64).reshape(-1, 4)
+    used = np.bincount(placements[:, 0], minlength=len(oris))[:len(oris)]
+    if not np.array_equal(used, np.array(rec["counts"])):
+        problems.append(f"shape counts {used.tolist()} != {list(rec['counts'])}")
+    if not len(placements):
+        return problems
+    offsets = [np.array(oris[sid][ori]) for sid, ori, _, _ in placements.tolist()]
+    sizes = np.array([len(o) for o in offsets])
+    cells = np.concatenate(offsets) + np.repeat(placements[:, 2:4], sizes, axis=0)
+    rows, cols = cells[:, 0], cells[:, 1]
+    if (rows < 0).any() or (cols < 0).any() or (rows >= height).any() or (cols >= width).any():
+        problems.append("placement outside the board")
+        return problems
+    cover = np.bincount(rows * width + cols, minlength=width * height)
+    if cover.max() > 1:
+        problems.append(f"{int((cover > 1).sum())} cell(s) covered more than once")
+    return problems
+
+
+def _verify_bits(oris, rec):
+    """Pure-Python fallback: one bitboard per placement, overlap via `&`."""
+    width, height = rec["width"], rec["height"]
+    problems = []
+    used = [0] * len(oris)
+    occupied = 0
+    overlap = False
+    for sid, ori, row, col in rec["placements"]:
+        used[sid] += 1
+        mask = 0
+        for dr, dc in oris[sid][ori]:
+            r, c = row + dr, col + dc
+            if not (0 <= r < height and 0 <= c < width):
+                problems.append("placement outside the board")
+                return problems
+            mask |= 1 << (r * width + c)
+        overlap |= bool(occupied & mask)
+        occupied |= mask
+    if used != list(rec["counts"]):
+        problems.append(f"shape counts {used} != {list(rec['counts'])}")
+    if overlap:
+        problems.append("cells covered more than once")
+    return problems
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from exercise_01 import read_shapes, visualize_solution
+
+    parser = argparse.ArgumentParser(description="Verify (and show) a puzzle 12 solution file")
+    parser.add_argument("input", help="puzzle input file (for the shapes)")
+    parser.add_argument("solutions", help="file written by exercise_01.py --export")
+    parser.add_argument("--show", action="store_true", help="render every packing")
+    args = parser.parse_args()
+
+    shapes = read_shapes(args.input)
+    records = read_solutions(args.solutions)
+    problems = verify(shapes, records)
+    for region, problem in problems:
+        print(f"Region {region + 1}: {problem}")
+    print(f"{len(records)} packing(s), {len({r for r, _ in problems})} invalid")
+    if args.show:
+        oris = {sid: orientation_cells(matrix) for sid, matrix in shapes.items()}
+        for rec in records:
+            print(f"Region {rec['region'] + 1}: {rec['width']}x{rec['height']}")
+            solution = [(sid, i, {(row + dr, col + dc) for dr, dc in oris[sid][ori]})
+                        for i, (sid, ori, row, col) in enumerate(rec["placements"])]
+            visualize_solution(rec["width"], rec["height"], solution)